@@ -0,0 +1,92 @@
+"""
+Import-time cost of the package modules.
+
+Each module is imported in a fresh interpreter, so the measured wall time and
+peak RSS include every dependency pulled in at import.
+
+    python benchmarks/bench_import.py --repeat 5 --output import.json
+"""
+import argparse
+import json
+import pathlib
+import statistics
+import subprocess
+import sys
+
+
+REPO_ROOT = pathlib.Path(__file__).resolve().parents[1]
+
+MODULES = [
+    'osm_process_tool.network.osm_network_preprocess',
+    'osm_process_tool.network.diagnosis',
+    'osm_process_tool.network.modify',
+    'osm_process_tool.load_data',
+    'osm_process_tool.landuse',
+    'osm_process_tool.poi',
+    'osm_process_tool.cli',
+]
+
+# Runs in the child interpreter; reports (import seconds, peak RSS in KiB).
+# ru_maxrss survives exec on Linux and would report the parent's peak, so the
+# high-water mark is reset first and read from /proc where possible.
+_CHILD = '''
+import resource, sys, time
+try:
+    with open('/proc/self/clear_refs', 'w') as f:
+        f.write('5')
+    hwm = True
+except OSError:
+    hwm = False
+sys.path.insert(0, {root!r})
+t0 = time.perf_counter()
+import {module}
+t1 = time.perf_counter()
+peak = None
+if hwm:
+    with open('/proc/self/status') as f:
+        peak = next((int(l.split()[1]) for l in f if l.startswith('VmHWM:')), None)
+if peak is None:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+print(t1 - t0, peak)
+'''
+
+
+def measure_import(module: str, repeat: int = 5) -> dict:
+    """
+    Median import time (s) and peak RSS (KiB) of `module` over `repeat` fresh interpreters.
+    """
+    times, rss = [], []
+    for _ in range(repeat):
+        out = subprocess.run(
+            [sys.executable, '-c', _CHILD.format(root=str(REPO_ROOT), module=module)],
+            check=True, capture_output=True, text=True).stdout.split()
+        times.append(float(out[0]))
+        rss.append(int(out[1]))
+
+    return {
+        'benchmark': 'import',
+        'name': module,
+        'repeat': repeat,
+        'wall_time_s': statistics.median(times),
+        'peak_rss_kib': statistics.median(rss),
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--output', help='write results as JSON (default: print)')
+    args = parser.parse_args(argv)
+
+    results = [measure_import(m, repeat=args.repeat) for m in MODULES]
+
+    text = json.dumps(results, indent=2)
+    if args.output:
+        pathlib.Path(args.output).write_text(text)
+    else:
+        print(text)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
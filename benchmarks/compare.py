@@ -0,0 +1,61 @@
+"""
+Compare two benchmark result files written by `run_benchmarks.py`.
+
+    python benchmarks/compare.py base.jsonl head.jsonl --threshold 1.1
+
+Prints the head/base ratio of wall time, peak traced memory and peak RSS per
+case and exits with status 1 if any ratio exceeds the threshold. A metric
+missing from either file (e.g. a run with --skip-rss) is shown as '-'.
+"""
+import argparse
+import json
+import sys
+
+
+def load_results(path: str) -> dict:
+    """
+    (benchmark, name, n_edges) → last record for that key in the file.
+    """
+    results = {}
+    with open(path) as f:
+        for line in f:
+            if line.strip():
+                r = json.loads(line)
+                results[(r['benchmark'], r['name'], r.get('n_edges'))] = r
+    return results
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('base')
+    parser.add_argument('head')
+    parser.add_argument('--threshold', type=float, default=1.1,
+                        help='ratio above which a case counts as a regression')
+    args = parser.parse_args(argv)
+
+    base, head = load_results(args.base), load_results(args.head)
+
+    def _ratio(b, h, key):
+        if b.get(key) is None or h.get(key) is None:
+            return None
+        return h[key] / b[key] if b[key] else float('nan')
+
+    def _fmt(ratio):
+        return f'{"-":>8}' if ratio is None else f'{ratio:>8.2f}'
+
+    regressed = False
+    print(f'{"case":<55} {"time":>8} {"traced":>8} {"rss":>8}')
+    for key in sorted(set(base) & set(head), key=str):
+        b, h = base[key], head[key]
+        ratios = [_ratio(b, h, k) for k in ('wall_time_s', 'peak_mem_bytes', 'peak_rss_kib')]
+
+        flag = ' !' if any(r is not None and r > args.threshold for r in ratios) else ''
+        regressed |= bool(flag)
+        label = f'{key[1]} @ {key[2]}' if key[2] is not None else key[1]
+        print(f'{label:<55} ' + ' '.join(_fmt(r) for r in ratios) + flag)
+
+    return 1 if regressed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,356 @@
+"""
+Benchmark harness for the network preprocessing functions.
+
+Every public function of `osm_network_preprocess`, `diagnosis` and `modify`
+is timed on seeded synthetic networks (see `synthetic.py`). Wall time, CPU
+time, peak traced memory (from a separate, untimed run) and peak RSS growth
+(from a fresh subprocess, so GEOS/PROJ allocations that tracemalloc misses
+are included) are written as JSON lines, one record per (function, size),
+tagged with the git commit so runs can be compared with `compare.py`.
+
+    python benchmarks/run_benchmarks.py --sizes 10k 100k --output bench.jsonl
+    python benchmarks/run_benchmarks.py --sizes 1M --only collapse_multidigraph_to_graph
+"""
+import argparse
+import contextlib
+import datetime
+import io
+import json
+import pathlib
+import gc
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
+
+REPO_ROOT = pathlib.Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(REPO_ROOT))
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parent))
+
+from synthetic import make_osm_like_graph  # noqa: E402
+from osm_process_tool import instrument  # noqa: E402
+from osm_process_tool.network import osm_network_preprocess as onp  # noqa: E402
+from osm_process_tool.network import diagnosis, modify, validate  # noqa: E402
+
+
+PROJECTED_CRS = 'EPSG:3414'
+
+
+def parse_size(text: str) -> int:
+    """
+    '10k' → 10_000, '2M' → 2_000_000.
+    """
+    text = text.strip().lower()
+    scale = {'k': 10 ** 3, 'm': 10 ** 6}.get(text[-1], 1)
+    return int(float(text.rstrip('km')) * scale)
+# ============================================================================================
+class Inputs:
+    """
+    Lazily built, cached benchmark inputs for one size, so each pipeline
+    stage is computed once and shared by the cases that consume it.
+    """
+
+    def __init__(self, n_edges: int, seed: int):
+        self.n_edges = n_edges
+        self.seed = seed
+        self._cache = {}
+
+    def _get(self, key, build):
+        if key not in self._cache:
+            self._cache[key] = build()
+        return self._cache[key]
+
+    @property
+    def raw(self):
+        return self._get('raw', lambda: make_osm_like_graph(self.n_edges, seed=self.seed))
+
+    @property
+    def projected(self):
+        return self._get('projected', lambda: onp.reproject_network_geometry(self.raw, PROJECTED_CRS))
+
+    @property
+    def collapsed(self):
+        return self._get('collapsed', lambda: onp.collapse_multidigraph_to_graph(self.projected, 'length_m'))
+
+    @property
+    def connected(self):
+        return self._get('connected', lambda: onp.process_isolated_nodes(self.collapsed, threshold=None))
+
+    @property
+    def boundary(self):
+        # Projected box over the south-west three quarters of the network
+        def _build():
+            import pyproj
+            import shapely
+            xs = [d['x'] for _, d in self.raw.nodes(data=True)]
+            ys = [d['y'] for _, d in self.raw.nodes(data=True)]
+            t = pyproj.Transformer.from_crs('EPSG:4326', PROJECTED_CRS, always_xy=True)
+            x0, y0 = t.transform(min(xs), min(ys))
+            x1, y1 = t.transform(max(xs), max(ys))
+            return shapely.box(x0, y0, x0 + (x1 - x0) * 0.75, y0 + (y1 - y0) * 0.75)
+        return self._get('boundary', _build)
+
+    @property
+    def cleaned(self):
+        # 'highway' reduced to its first value, as in the notebook's attribute clean-up
+        def _build():
+            G = self.raw.copy()
+            for _, _, d in G.edges(data=True):
+                if isinstance(d.get('highway'), list):
+                    d['highway'] = d['highway'][0]
+            return G
+        return self._get('cleaned', _build)
+
+    @property
+    def with_travel_attrs(self):
+        def _build():
+            G = self.connected.copy()
+            for _, _, d in G.edges(data=True):
+                d['distance'] = d['length_m']
+                d['travel_duration'] = d['length_m'] / 1.4
+            return G
+        return self._get('with_travel_attrs', _build)
+# ============================================================================================
+def _print_graph_info_captured(G):
+    # print_graph_info returns at once in quiet mode; run it loud and discard the text
+    quiet = instrument.is_quiet()
+    instrument.set_quiet(False)
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            diagnosis.print_graph_info(G)
+    finally:
+        instrument.set_quiet(quiet)
+
+
+# name → (function, argument builder); the builder runs outside the timed region
+CASES = {
+    # osm_network_preprocess
+    'remove_nodes_outside_boundary': (
+        onp.remove_nodes_outside_boundary,
+        lambda I: ((I.raw, PROJECTED_CRS, I.boundary), {})),
+    'reproject_network_geometry': (
+        onp.reproject_network_geometry,
+        lambda I: ((I.raw, PROJECTED_CRS), {})),
+    'collapse_multidigraph_to_graph': (
+        onp.collapse_multidigraph_to_graph,
+        lambda I: ((I.projected, 'length_m'), {})),
+    'process_isolated_nodes': (
+        onp.process_isolated_nodes,
+        lambda I: ((I.collapsed,), {'threshold': 100.})),
+    'simplify_degree2_nodes': (
+        onp.simplify_degree2_nodes,
+        lambda I: ((I.connected,), {})),
+    'graph_to_geodataframe': (
+        onp.graph_to_geodataframe,
+        lambda I: ((I.connected, PROJECTED_CRS), {'node_attr_x': 'proj_x', 'node_attr_y': 'proj_y'})),
+    'convert_network_geometry_attr_to_wkt': (
+        onp.convert_network_geometry_attr_to_wkt,
+        lambda I: ((I.connected,), {})),
+    # diagnosis
+    'get_giant_component': (
+        diagnosis.get_giant_component,
+        lambda I: ((I.raw,), {})),
+    'print_graph_info': (
+        _print_graph_info_captured,
+        lambda I: ((I.raw,), {})),
+    'compute_travel_statistics': (
+        diagnosis.compute_travel_statistics,
+        lambda I: ((I.with_travel_attrs,), {})),
+    # modify
+    'remove_node_edge_attrs': (
+        modify.remove_node_edge_attrs,
+        lambda I: ((I.raw, ['street_count'], ['osmid', 'reversed', 'length']), {})),
+    'normalize_edge_tags': (
+        modify.normalize_edge_tags,
+        lambda I: ((I.connected,), {})),
+    'remove_edge_by_attr_value': (
+        modify.remove_edge_by_attr_value,
+        lambda I: ((I.cleaned, 'highway', ['motorway', 'trunk']), {})),
+    # validate
+    'validate_network': (
+        validate.validate_network,
+        lambda I: ((I.connected,), {})),
+}
+# ============================================================================================
+def run_case(name: str, inputs: Inputs, repeat: int = 1) -> dict:
+    """
+    Time one case; reports the best wall time and the peak traced memory.
+
+    A first, untimed call runs under tracemalloc to measure peak memory and
+    doubles as a warm-up (lazy imports, caches). The timed calls then run
+    without tracing, whose per-allocation hooks would inflate the times.
+    """
+    func, build_args = CASES[name]
+    args, kwargs = build_args(inputs)
+
+    tracemalloc.start()
+    func(*args, **kwargs)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    walls, cpus = [], []
+    for _ in range(repeat):
+        t_wall, t_cpu = time.perf_counter(), time.process_time()
+        func(*args, **kwargs)
+        walls.append(time.perf_counter() - t_wall)
+        cpus.append(time.process_time() - t_cpu)
+
+    return {
+        'benchmark': 'function',
+        'name': name,
+        'n_edges': inputs.n_edges,
+        'input_nodes': args[0].number_of_nodes(),
+        'input_edges': args[0].number_of_edges(),
+        'repeat': repeat,
+        'wall_time_s': min(walls),
+        'cpu_time_s': min(cpus),
+        'peak_mem_bytes': peak,
+    }
+# ============================================================================================
+def _proc_status_kib(field: str):
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith(field + ':'):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return None
+
+
+def _reset_peak_rss() -> bool:
+    # Linux resets VmHWM to the current RSS on writing 5 to clear_refs
+    try:
+        with open('/proc/self/clear_refs', 'w') as f:
+            f.write('5')
+        return True
+    except OSError:
+        return False
+
+
+def rss_case_child(name: str, n_edges: int, seed: int) -> dict:
+    """
+    Body of the subprocess measuring one case's peak RSS growth (KiB).
+
+    The inputs are built first; the peak is then reset (Linux), or else
+    ru_maxrss is read before and after the call, in which case a case that
+    stays below the input-building peak reports 0.
+    """
+    instrument.set_quiet(True)
+    preload_dependencies()
+    func, build_args = CASES[name]
+    args, kwargs = build_args(Inputs(n_edges, seed=seed))
+    gc.collect()
+
+    if _reset_peak_rss() and _proc_status_kib('VmHWM') is not None:
+        base = _proc_status_kib('VmRSS')
+        func(*args, **kwargs)
+        return {'peak_rss_kib': _proc_status_kib('VmHWM') - base, 'rss_method': 'VmHWM'}
+
+    if resource is None:
+        return {'peak_rss_kib': None, 'rss_method': None}
+    scale = 1024 if sys.platform == 'darwin' else 1  # ru_maxrss is in bytes on macOS
+    base = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss // scale
+    func(*args, **kwargs)
+    return {'peak_rss_kib': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss // scale - base,
+            'rss_method': 'ru_maxrss'}
+
+
+# Runs in the child interpreter; prints the rss_case_child record as JSON
+_RSS_CHILD = '''
+import json, sys
+sys.path.insert(0, {bench!r})
+import run_benchmarks
+print(json.dumps(run_benchmarks.rss_case_child({name!r}, {n_edges!r}, {seed!r})))
+'''
+
+
+def measure_case_rss(name: str, n_edges: int, seed: int) -> dict:
+    """
+    Peak RSS growth of one case, measured in a fresh interpreter.
+    """
+    code = _RSS_CHILD.format(bench=str(pathlib.Path(__file__).resolve().parent),
+                             name=name, n_edges=n_edges, seed=seed)
+    out = subprocess.run([sys.executable, '-c', code], check=True, capture_output=True, text=True).stdout
+    return json.loads(out.strip().splitlines()[-1])
+# ============================================================================================
+# Imported up front so no case pays for loading them inside its timed region
+DEPENDENCIES = ['numpy', 'pandas', 'scipy.sparse', 'shapely', 'pyproj', 'geopandas', 'tqdm']
+
+
+def preload_dependencies() -> None:
+    import importlib
+    for module in DEPENDENCIES:
+        importlib.import_module(module)
+
+
+def environment_info() -> dict:
+    try:
+        commit = subprocess.run(
+            ['git', 'rev-parse', 'HEAD'], cwd=REPO_ROOT, check=True,
+            capture_output=True, text=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+
+    return {
+        'commit': commit,
+        'timestamp': datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'platform': platform.platform(),
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', nargs='+', default=['10k'],
+                        help='approximate directed edge counts, e.g. 10k 100k 1M 10M')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--repeat', type=int, default=1)
+    parser.add_argument('--only', nargs='+', choices=sorted(CASES), help='run only these cases')
+    parser.add_argument('--skip-import', action='store_true', help='skip the import-time benchmark')
+    parser.add_argument('--skip-rss', action='store_true',
+                        help='skip the per-case subprocess measuring peak RSS (rebuilds the inputs per case)')
+    parser.add_argument('--output', help='append JSON lines to this file (default: stdout)')
+    args = parser.parse_args(argv)
+
+    # Progress bars and messages would dominate the timings of small cases
+    instrument.set_quiet(True)
+
+    env = environment_info()
+    preload_dependencies()
+    out = open(args.output, 'a') if args.output else sys.stdout
+
+    def _emit(record):
+        out.write(json.dumps({**env, **record}) + '\n')
+        out.flush()
+
+    try:
+        if not args.skip_import:
+            from bench_import import MODULES, measure_import
+            for module in MODULES:
+                _emit(measure_import(module, repeat=max(args.repeat, 3)))
+
+        for size in args.sizes:
+            inputs = Inputs(parse_size(size), seed=args.seed)
+            for name in (args.only or CASES):
+                print(f'[{size}] {name}', file=sys.stderr)
+                record = run_case(name, inputs, repeat=args.repeat)
+                if not args.skip_rss:
+                    record.update(measure_case_rss(name, inputs.n_edges, args.seed))
+                _emit(record)
+    finally:
+        if args.output:
+            out.close()
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
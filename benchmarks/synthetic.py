@@ -0,0 +1,136 @@
+"""
+Seeded generators of synthetic OSM-like networks for benchmarking.
+
+The graphs mimic what `osmnx.graph_from_xml` returns: a MultiDiGraph whose
+nodes carry lon/lat under 'x'/'y' and whose edges carry osmnx-style tags.
+"""
+import numpy as np
+import networkx as nx
+import shapely
+
+
+HIGHWAY_VALUES = np.array(['footway', 'residential', 'service', 'primary', 'secondary',
+                           'tertiary', 'path', 'steps', 'motorway', 'trunk'])
+
+
+def make_osm_like_graph(
+    n_edges: int,
+    seed: int = 0,
+    lon0: float = 103.8,
+    lat0: float = 1.3,
+    spacing_deg: float = 5e-4,
+    p_geometry: float = 0.7,
+    p_parallel: float = 0.02,
+    p_oneway: float = 0.2,
+    p_list_tag: float = 0.05,
+    isolated_frac: float = 0.01,
+) -> nx.MultiDiGraph:
+    """
+    Build a jittered grid street network with about `n_edges` directed edges.
+
+    Parameters
+    ----------
+    n_edges : int
+        Approximate number of directed edges.
+    seed : int, default 0
+        Random seed; equal seeds give identical graphs.
+    lon0, lat0 : float
+        South-west corner of the grid (WGS84).
+    spacing_deg : float
+        Grid spacing in degrees.
+    p_geometry : float, default 0.7
+        Share of streets carrying a LineString geometry (others have none,
+        like straight OSM ways after osmnx simplification).
+    p_parallel : float, default 0.02
+        Share of streets with an extra parallel edge.
+    p_oneway : float, default 0.2
+        Share of streets without a reverse edge.
+    p_list_tag : float, default 0.05
+        Share of streets whose 'highway' / 'osmid' tags are lists.
+    isolated_frac : float, default 0.01
+        Isolated nodes added, as a share of grid nodes.
+
+    Returns
+    -------
+    nx.MultiDiGraph
+    """
+    rng = np.random.default_rng(seed)
+
+    # Each grid node has ~2 streets, each street ~2 directed edges
+    side = max(2, int(np.ceil(np.sqrt(n_edges / 4))))
+    n_grid = side * side
+    n_iso = int(isolated_frac * n_grid)
+
+    ii, jj = np.divmod(np.arange(n_grid), side)
+    lon = lon0 + ii * spacing_deg + rng.normal(0, spacing_deg * 0.1, n_grid)
+    lat = lat0 + jj * spacing_deg + rng.normal(0, spacing_deg * 0.1, n_grid)
+    iso_lon = lon0 + rng.uniform(0, side * spacing_deg, n_iso)
+    iso_lat = lat0 + rng.uniform(0, side * spacing_deg, n_iso)
+
+    # Streets to the east and north neighbour
+    node = np.arange(n_grid)
+    east = node[ii < side - 1]
+    north = node[jj < side - 1]
+    su = np.concatenate([east, north])
+    sv = np.concatenate([east + side, north + 1])
+    n_streets = len(su)
+
+    has_geom = rng.random(n_streets) < p_geometry
+    is_oneway = rng.random(n_streets) < p_oneway
+    is_parallel = rng.random(n_streets) < p_parallel
+    is_list = rng.random(n_streets) < p_list_tag
+    highway = HIGHWAY_VALUES[rng.integers(0, len(HIGHWAY_VALUES), n_streets)]
+    osmid = rng.integers(1, 2 ** 40, n_streets)
+
+    # Curved geometries: one jittered midpoint between the end nodes
+    mid_lon = (lon[su] + lon[sv]) / 2 + rng.normal(0, spacing_deg * 0.05, n_streets)
+    mid_lat = (lat[su] + lat[sv]) / 2 + rng.normal(0, spacing_deg * 0.05, n_streets)
+    coords = np.stack([
+        np.column_stack([lon[su], lat[su]]),
+        np.column_stack([mid_lon, mid_lat]),
+        np.column_stack([lon[sv], lat[sv]])], axis=1)
+    geoms = shapely.linestrings(coords)
+    approx_len = np.hypot(lon[sv] - lon[su], lat[sv] - lat[su]) * 111_000
+
+    G = nx.MultiDiGraph(crs='epsg:4326')
+    G.add_nodes_from((int(n), {'x': float(x), 'y': float(y), 'street_count': 4})
+                     for n, x, y in zip(node, lon, lat))
+    G.add_nodes_from((int(n_grid + k), {'x': float(x), 'y': float(y), 'street_count': 0})
+                     for k, (x, y) in enumerate(zip(iso_lon, iso_lat)))
+
+    def _edges():
+        for s in range(n_streets):
+            u, v = int(su[s]), int(sv[s])
+            attrs = {
+                'osmid': [int(osmid[s]), int(osmid[s]) + 1] if is_list[s] else int(osmid[s]),
+                'highway': [highway[s], 'footway'] if is_list[s] else str(highway[s]),
+                'oneway': bool(is_oneway[s]),
+                'length': float(approx_len[s]),
+            }
+            if has_geom[s]:
+                yield u, v, {**attrs, 'reversed': False, 'geometry': geoms[s]}
+                if not is_oneway[s]:
+                    yield v, u, {**attrs, 'reversed': True, 'geometry': geoms[s].reverse()}
+            else:
+                yield u, v, {**attrs, 'reversed': False}
+                if not is_oneway[s]:
+                    yield v, u, {**attrs, 'reversed': True}
+            if is_parallel[s]:
+                yield u, v, {**attrs, 'length': float(approx_len[s]) * 1.2}
+
+    G.add_edges_from(_edges())
+
+    return G
+# ============================================================================================
+def make_processed_graph(n_edges: int, seed: int = 0, projected_crs: str = 'EPSG:3414') -> nx.Graph:
+    """
+    Synthetic network taken through reprojection and collapse, i.e. the
+    undirected `nx.Graph` that downstream steps consume.
+    """
+    from osm_process_tool.network.osm_network_preprocess import (
+        reproject_network_geometry, collapse_multidigraph_to_graph)
+
+    G = make_osm_like_graph(n_edges, seed=seed)
+    G = reproject_network_geometry(G, projected_crs=projected_crs)
+    return collapse_multidigraph_to_graph(G, weight='length_m')
+# ============================================================================================
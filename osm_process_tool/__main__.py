@@ -0,0 +1,5 @@
+import sys
+
+from osm_process_tool.cli import main
+
+sys.exit(main())
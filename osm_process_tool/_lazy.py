@@ -0,0 +1,53 @@
+import importlib
+import sys
+import types
+
+
+class _LazyModule(types.ModuleType):
+    """
+    Module placeholder that imports the real module on first attribute access.
+
+    Resolved attributes are cached on the placeholder, so later lookups are
+    plain attribute reads and skip `__getattr__`.
+    """
+
+    def __init__(self, name: str):
+        super().__init__(name)
+        self.__dict__['_lazy_module'] = None
+
+    def _load(self) -> types.ModuleType:
+        module = self.__dict__['_lazy_module']
+        if module is None:
+            module = importlib.import_module(self.__name__)
+            self.__dict__['_lazy_module'] = module
+        return module
+
+    def __getattr__(self, attr: str):
+        value = getattr(self._load(), attr)
+        self.__dict__[attr] = value
+        return value
+
+    def __dir__(self):
+        return dir(self._load())
+
+
+def lazy_import(name: str) -> types.ModuleType:
+    """
+    Return module `name`, deferring its import until an attribute is used.
+
+    If the module has already been imported, it is returned directly.
+
+    Parameters
+    ----------
+    name : str
+        Fully qualified module name, e.g. "geopandas" or "shapely.ops".
+
+    Returns
+    -------
+    types.ModuleType
+        The module itself, or a lazy placeholder for it.
+    """
+    if name in sys.modules:
+        return sys.modules[name]
+    return _LazyModule(name)
+# ============================================================================================
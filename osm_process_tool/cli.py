@@ -0,0 +1,220 @@
+"""
+Command-line entry point running the preprocessing workflows from a config file.
+
+Usage::
+
+    python -m osm_process_tool network --config network.toml
+    python -m osm_process_tool poi --config poi.json
+    python -m osm_process_tool landuse --config landuse.toml
+
+A config file is TOML or JSON; TOML needs Python 3.11+ or the `tomli`
+package. It either holds the options of one command at
+top level, or one table per command (`[network]`, `[poi]`, `[landuse]`).
+
+network options
+    input               : .osm/.xml (read with osmnx.graph_from_xml) or .graphml
+    output_dir          : output folder for nodes.gpkg, edges.gpkg, network.graphml
+    projected_crs       : target projected CRS, e.g. "EPSG:3414"
+    source_crs          : CRS of the node lon/lat (default "EPSG:4326")
+    boundary            : optional vector file; nodes outside it are removed
+    isolated_threshold  : distance to connect isolated nodes (default: drop them)
+    simplify            : merge degree-2 chains (default false)
+    node_prefix         : optional prefix for relabelled node IDs, e.g. "W_"
+    remove_node_attrs   : node attributes to drop
+    remove_edge_attrs   : edge attributes to drop
+    missing_tag_value   : value for absent highway/crossing/bridge/tunnel tags
+                          (default "unknown"); see `network.modify.normalize_edge_tags`
+    remove_highway      : highway values whose edges are removed
+
+poi options
+    osm_folder, save_folder, pattern, prefix, tags_filter, columns
+    (see `osm_process_tool.poi.extract_osm_poi_snapshots`)
+
+landuse options
+    input               : OSM land use polygons (any file readable by geopandas)
+    output              : output vector file
+    projected_crs       : optional CRS to project the polygons to
+    landuse_cols        : tag columns in priority order
+    tag_table_path      : optional mapping table (default data/osm_tags/tag_processing.xlsx)
+"""
+import argparse
+import json
+import pathlib
+import sys
+
+from typing import Any, Dict, List, Optional
+
+from . import instrument
+
+
+def load_config(path, section=None) -> Dict[str, Any]:
+    """
+    Read a TOML or JSON config file, returning the `section` table if present.
+    """
+    path = pathlib.Path(path)
+    if path.suffix.lower() == '.toml':
+        try:
+            import tomllib
+        except ImportError:
+            try:
+                import tomli as tomllib
+            except ImportError:
+                raise ImportError(
+                    f'Reading {path.name} needs Python 3.11+ or the tomli package '
+                    '(pip install tomli); alternatively use a JSON config') from None
+        with open(path, 'rb') as f:
+            config = tomllib.load(f)
+    else:
+        with open(path, encoding='utf-8') as f:
+            config = json.load(f)
+
+    if section is not None and isinstance(config.get(section), dict):
+        config = config[section]
+    return config
+# ============================================================================================
+def _stringify_list_attrs(records) -> None:
+    # OSM tags may be list-valued after osmnx simplification; GraphML/GPKG need scalars
+    for attrs in records:
+        for k, v in attrs.items():
+            if isinstance(v, list):
+                attrs[k] = ','.join(map(str, v))
+
+
+def run_network(config: Dict[str, Any]) -> None:
+    """
+    Run the walking-network workflow of `tutorials/preprocess/network.ipynb`.
+    """
+    import networkx as nx
+    from .network.diagnosis import print_graph_info
+    from .network.modify import remove_node_edge_attrs, remove_edge_by_attr_value, normalize_edge_tags
+    from .network.osm_network_preprocess import (
+        remove_nodes_outside_boundary,
+        reproject_network_geometry,
+        collapse_multidigraph_to_graph,
+        process_isolated_nodes,
+        simplify_degree2_nodes,
+        graph_to_geodataframe,
+        convert_network_geometry_attr_to_wkt)
+
+    input_path = pathlib.Path(config['input'])
+    output_dir = pathlib.Path(config['output_dir'])
+    projected_crs = config['projected_crs']
+    source_crs = config.get('source_crs', 'EPSG:4326')
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    # 1) Load network; 'crossing' is not among osmnx's default way tags
+    import osmnx as ox
+    if 'crossing' not in ox.settings.useful_tags_way:
+        ox.settings.useful_tags_way = list(ox.settings.useful_tags_way) + ['crossing']
+    if input_path.suffix.lower() == '.graphml':
+        network = ox.load_graphml(input_path)
+    else:
+        network = ox.graph.graph_from_xml(
+            input_path, bidirectional=True, simplify=True, retain_all=True, encoding='utf-8')
+    print_graph_info(network)
+
+    # 2) Clip nodes by boundary
+    if config.get('boundary'):
+        import geopandas as gpd
+        boundary = gpd.read_file(config['boundary']).to_crs(projected_crs).geometry.union_all()
+        network = remove_nodes_outside_boundary(
+            network, projected_crs=projected_crs, boundary=boundary, source_crs=source_crs)
+
+    # 3) Reproject, collapse, connect isolated nodes
+    network = reproject_network_geometry(network, projected_crs=projected_crs, source_crs=source_crs)
+    network = collapse_multidigraph_to_graph(network, weight='length_m')
+    # the collapsed graph does not carry over graph-level attributes
+    network.graph['crs'] = projected_crs
+    network = process_isolated_nodes(network, threshold=config.get('isolated_threshold'))
+    if config.get('simplify', False):
+        network = simplify_degree2_nodes(network)
+
+    if config.get('node_prefix'):
+        network = nx.relabel_nodes(network, {n: f"{config['node_prefix']}{n}" for n in network.nodes()})
+
+    # 4) Attribute clean-up
+    network = remove_node_edge_attrs(
+        network,
+        node_attrs=config.get('remove_node_attrs', []),
+        edge_attrs=config.get('remove_edge_attrs', []))
+    network = normalize_edge_tags(network, missing=config.get('missing_tag_value', 'unknown'))
+    if config.get('remove_highway'):
+        network = remove_edge_by_attr_value(
+            network, attr_name='highway', attr_values=config['remove_highway'], remove_isolated_nodes=True)
+    _stringify_list_attrs(attrs for _, attrs in network.nodes(data=True))
+    _stringify_list_attrs(attrs for _, _, attrs in network.edges(data=True))
+    print_graph_info(network)
+
+    # 5) Save
+    node_gdf, edge_gdf = graph_to_geodataframe(
+        network, crs=projected_crs, node_attr_x='proj_x', node_attr_y='proj_y')
+    node_gdf.to_file(output_dir / 'nodes.gpkg', driver='GPKG')
+    edge_gdf.to_file(output_dir / 'edges.gpkg', driver='GPKG')
+
+    network = convert_network_geometry_attr_to_wkt(network, node_attr=None, edge_attr='geometry')
+    network.graph['crs'] = str(network.graph['crs'])
+    nx.write_graphml(network, output_dir / 'network.graphml')
+# ============================================================================================
+def run_poi(config: Dict[str, Any]) -> None:
+    """
+    Run the POI extraction workflow of `tutorials/extract/extract_poi_osm.ipynb`.
+    """
+    from .poi import extract_osm_poi_snapshots
+
+    saved = extract_osm_poi_snapshots(
+        osm_folder=config['osm_folder'],
+        save_folder=config['save_folder'],
+        pattern=config.get('pattern', '*.osm.pbf'),
+        prefix=config.get('prefix'),
+        tags_filter=config.get('tags_filter'),
+        columns=config.get('columns'))
+    instrument.echo(f'Saved POI snapshots: {len(saved)}')
+# ============================================================================================
+def run_landuse(config: Dict[str, Any]) -> None:
+    """
+    Run the land use workflow of `tutorials/extract/extract landuse`.
+    """
+    import geopandas as gpd
+    from .landuse import extract_osm_landuse, merge_landuse_type
+
+    landuse_cols = config.get('landuse_cols', ['landuse', 'amenity', 'leisure', 'natural'])
+
+    data = gpd.read_file(config['input'])
+    if config.get('projected_crs'):
+        data = data.to_crs(config['projected_crs'])
+    assert data.crs is not None and data.crs.is_projected, 'Land use data must be in a projected CRS'
+
+    data = extract_osm_landuse(data, landuse_col=landuse_cols, tag_table_path=config.get('tag_table_path'))
+    data = merge_landuse_type(data, landuse_cols=landuse_cols)
+    data.to_file(config['output'])
+# ============================================================================================
+COMMANDS = {
+    'network': run_network,
+    'poi': run_poi,
+    'landuse': run_landuse,
+}
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog='osm-preprocess',
+        description='Run OSM preprocessing workflows from a config file.')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    for name, func in COMMANDS.items():
+        sub = subparsers.add_parser(name, help=func.__doc__.strip().splitlines()[0])
+        sub.add_argument('-c', '--config', required=True, help='TOML or JSON config file')
+        sub.add_argument('-q', '--quiet', action='store_true', help='no progress bars or messages')
+        sub.add_argument('--metrics', help='append per-step metrics as JSON lines to this file')
+
+    args = parser.parse_args(argv)
+
+    if args.quiet:
+        instrument.set_quiet(True)
+    if args.metrics:
+        instrument.add_sink(instrument.JsonLinesSink(args.metrics))
+
+    COMMANDS[args.command](load_config(args.config, section=args.command))
+    return 0
+# ============================================================================================
+if __name__ == '__main__':
+    sys.exit(main())
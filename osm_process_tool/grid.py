@@ -0,0 +1,309 @@
+from __future__ import annotations
+
+import os
+
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import TYPE_CHECKING, Optional, Tuple
+
+from ._lazy import lazy_import
+from .instrument import instrumented, progress
+
+if TYPE_CHECKING:
+    import numpy as np
+    import pandas as pd
+    import geopandas as gpd
+
+np = lazy_import('numpy')
+pd = lazy_import('pandas')
+gpd = lazy_import('geopandas')
+shapely = lazy_import('shapely')
+
+
+def _check_projected(data: gpd.GeoDataFrame) -> None:
+    assert data.crs is not None and data.crs.is_projected, \
+        'Input must be in a projected CRS so that cell sizes and areas are in metres'
+
+
+def grid_cell_index(
+    x: np.ndarray,
+    y: np.ndarray,
+    cell_size: float,
+    origin: Tuple[float, float] = (0., 0.),
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Integer (col, row) of the square grid cell containing each point.
+
+    Cell (col, row) covers [x0 + col * size, x0 + (col + 1) * size) ×
+    [y0 + row * size, y0 + (row + 1) * size). With the default origin the
+    grid is aligned to the CRS axes, so cell indices are stable across runs
+    and inputs.
+    """
+    col = np.floor((np.asarray(x, dtype=float) - origin[0]) / cell_size).astype(np.int64)
+    row = np.floor((np.asarray(y, dtype=float) - origin[1]) / cell_size).astype(np.int64)
+    return col, row
+# ============================================================================================
+@instrumented
+def count_points_by_grid(
+    points: gpd.GeoDataFrame,
+    cell_size: float,
+    category_col: Optional[str] = None,
+    origin: Tuple[float, float] = (0., 0.),
+) -> pd.DataFrame:
+    """
+    Count POIs per grid cell and category.
+
+    Non-point geometries (e.g. POIs mapped as ways) are placed by a point on
+    their surface. Binning is integer arithmetic on the coordinates, and
+    counting a single `np.bincount`, so runtime is linear in the number of POIs.
+
+    Parameters
+    ----------
+    points : geopandas.GeoDataFrame
+        POIs in a projected CRS.
+    cell_size : float
+        Cell edge length in CRS units (metres).
+    category_col : str or None
+        Column with the POI category; None counts all POIs together.
+    origin : (float, float), default (0, 0)
+        Grid origin in CRS coordinates.
+
+    Returns
+    -------
+    pandas.DataFrame
+        Indexed by (col, row), one column per category ('count' if
+        `category_col` is None); only non-empty cells are listed.
+    """
+    _check_projected(points)
+
+    geoms = points.geometry.values
+    not_point = shapely.get_type_id(geoms) != 0
+    geoms = np.asarray(geoms).copy()
+    geoms[not_point] = shapely.point_on_surface(geoms[not_point])
+    valid = ~shapely.is_missing(geoms) & ~shapely.is_empty(geoms)
+
+    col, row = grid_cell_index(shapely.get_x(geoms[valid]), shapely.get_y(geoms[valid]), cell_size, origin)
+
+    if category_col is None:
+        codes, categories = np.zeros(len(col), dtype=np.int64), pd.Index(['count'])
+    else:
+        codes, categories = pd.factorize(points[category_col].to_numpy()[valid])
+        # POIs without a category are not counted
+        keep = codes >= 0
+        col, row, codes = col[keep], row[keep], codes[keep]
+
+    # Dense cell ids over the occupied bounding box, then one bincount
+    if len(col) == 0:
+        return pd.DataFrame(columns=categories, index=pd.MultiIndex.from_arrays([[], []], names=['col', 'row']))
+    c0, r0 = col.min(), row.min()
+    n_cols = col.max() - c0 + 1
+    cell = (row - r0) * n_cols + (col - c0)
+    cell_ids, cell_inv = np.unique(cell, return_inverse=True)
+    counts = np.bincount(cell_inv * len(categories) + codes, minlength=len(cell_ids) * len(categories))
+
+    index = pd.MultiIndex.from_arrays([cell_ids % n_cols + c0, cell_ids // n_cols + r0], names=['col', 'row'])
+    return pd.DataFrame(counts.reshape(len(cell_ids), len(categories)), index=index, columns=categories)
+# ============================================================================================
+def _tile_landuse_area(
+    geoms: np.ndarray,
+    codes: np.ndarray,
+    tile_col: int,
+    tile_row: int,
+    tile_cells: int,
+    cell_size: float,
+    origin: Tuple[float, float],
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    # Clip the land-use polygons of one tile to its cells; returns (col, row, code, area)
+    cols, rows = np.meshgrid(
+        np.arange(tile_col * tile_cells, (tile_col + 1) * tile_cells),
+        np.arange(tile_row * tile_cells, (tile_row + 1) * tile_cells))
+    cols, rows = cols.ravel(), rows.ravel()
+    x0 = origin[0] + cols * cell_size
+    y0 = origin[1] + rows * cell_size
+    cells = shapely.box(x0, y0, x0 + cell_size, y0 + cell_size)
+
+    # (polygon, cell) pairs that overlap
+    poly_idx, cell_idx = shapely.STRtree(cells).query(geoms, predicate='intersects')
+    area = shapely.area(shapely.intersection(geoms[poly_idx], cells[cell_idx]))
+
+    keep = area > 0
+    return cols[cell_idx[keep]], rows[cell_idx[keep]], codes[poly_idx[keep]], area[keep]
+
+
+@instrumented
+def landuse_area_by_grid(
+    landuse: gpd.GeoDataFrame,
+    cell_size: float,
+    category_col: str = 'landuse',
+    origin: Tuple[float, float] = (0., 0.),
+    tile_cells: int = 32,
+    n_jobs: int = 1,
+) -> pd.DataFrame:
+    """
+    Land-use area per grid cell and category.
+
+    The grid is split into tiles of `tile_cells` × `tile_cells` cells. An
+    STRtree over the polygons selects each tile's candidates, which are
+    clipped to the tile; within a tile, a second STRtree over the cell boxes
+    pairs the clipped pieces with cells, and all pairs are clipped in one
+    vectorized `shapely.intersection`. Tiles run in parallel across processes
+    when `n_jobs` > 1.
+
+    Overlapping polygons are counted once each; use the output of
+    `merge_landuse_type`, which is non-overlapping, to get a partition.
+
+    Parameters
+    ----------
+    landuse : geopandas.GeoDataFrame
+        Land-use polygons in a projected CRS.
+    cell_size : float
+        Cell edge length in CRS units (metres).
+    category_col : str, default 'landuse'
+        Column with the land-use category.
+    origin : (float, float), default (0, 0)
+        Grid origin in CRS coordinates.
+    tile_cells : int, default 32
+        Tile edge length in cells.
+    n_jobs : int, default 1
+        Number of worker processes; -1 uses all CPUs.
+
+    Returns
+    -------
+    pandas.DataFrame
+        Indexed by (col, row), one area column per category (CRS units²);
+        only cells with some land use are listed.
+    """
+    _check_projected(landuse)
+
+    data = landuse[landuse[category_col].notna()]
+    geoms = np.asarray(data.geometry.values)
+    valid = ~shapely.is_missing(geoms) & ~shapely.is_empty(geoms)
+    geoms = geoms[valid]
+    codes, categories = pd.factorize(data[category_col].to_numpy()[valid])
+
+    empty = pd.DataFrame(
+        columns=categories, index=pd.MultiIndex.from_arrays([[], []], names=['col', 'row']), dtype=float)
+    if len(geoms) == 0:
+        return empty
+
+    # 1) Tiles touched by each polygon's bounding box
+    tile_size = cell_size * tile_cells
+    bounds = shapely.bounds(geoms)
+    tc0, tr0 = grid_cell_index(bounds[:, 0], bounds[:, 1], tile_size, origin)
+    tc1, tr1 = grid_cell_index(bounds[:, 2], bounds[:, 3], tile_size, origin)
+    tiles = set()
+    for c_min, r_min, c_max, r_max in zip(tc0.tolist(), tr0.tolist(), tc1.tolist(), tr1.tolist()):
+        tiles.update((c, r) for c in range(c_min, c_max + 1) for r in range(r_min, r_max + 1))
+
+    # 2) Candidate polygons per tile, clipped to the tile so that large,
+    #    detailed polygons are not intersected whole with every cell
+    tree = shapely.STRtree(geoms)
+    tasks = []
+    for c, r in sorted(tiles):
+        x0, y0 = origin[0] + c * tile_size, origin[1] + r * tile_size
+        tile_box = shapely.box(x0, y0, x0 + tile_size, y0 + tile_size)
+        cand = tree.query(tile_box, predicate='intersects')
+        clipped = shapely.intersection(geoms[cand], tile_box)
+        keep = shapely.area(clipped) > 0
+        if keep.any():
+            tasks.append((clipped[keep], codes[cand[keep]], c, r, tile_cells, cell_size, origin))
+
+    # 3) Clip per tile, serially or across processes; no polygon with area
+    #    (e.g. only lines) leaves nothing to clip
+    if not tasks:
+        return empty
+
+    n_jobs = os.cpu_count() if n_jobs == -1 else n_jobs
+    if n_jobs == 1:
+        parts = [_tile_landuse_area(*t) for t in progress(tasks, desc='Clipping land use tiles')]
+    else:
+        with ProcessPoolExecutor(max_workers=n_jobs) as pool:
+            # At most 2 * n_jobs tiles pickled and in flight at once
+            def _bounded():
+                pending = deque()
+                for t in tasks:
+                    pending.append(pool.submit(_tile_landuse_area, *t))
+                    if len(pending) >= 2 * n_jobs:
+                        yield pending.popleft().result()
+                while pending:
+                    yield pending.popleft().result()
+
+            parts = list(progress(_bounded(), total=len(tasks), desc='Clipping land use tiles'))
+
+    col, row, code, area = (np.concatenate(a) for a in zip(*parts))
+
+    # 4) Sum areas per (cell, category) and pivot wide
+    table = pd.DataFrame({'col': col, 'row': row, 'code': code, 'area': area}) \
+        .groupby(['col', 'row', 'code'])['area'].sum() \
+        .unstack('code', fill_value=0.)
+    table.columns = categories[table.columns]
+    return table.reindex(columns=categories, fill_value=0.)
+# ============================================================================================
+@instrumented
+def build_grid_features(
+    cell_size: float,
+    pois: Optional[gpd.GeoDataFrame] = None,
+    landuse: Optional[gpd.GeoDataFrame] = None,
+    poi_category_col: Optional[str] = None,
+    landuse_category_col: str = 'landuse',
+    origin: Tuple[float, float] = (0., 0.),
+    tile_cells: int = 32,
+    n_jobs: int = 1,
+    with_geometry: bool = False,
+) -> pd.DataFrame:
+    """
+    Wide per-cell feature table from POIs and land use.
+
+    Columns are `poi_<category>` counts (see `count_points_by_grid`) and
+    `landuse_<category>` areas (see `landuse_area_by_grid`); cells missing
+    from one source get 0.
+
+    Parameters
+    ----------
+    cell_size : float
+        Cell edge length in CRS units (metres).
+    pois : geopandas.GeoDataFrame or None
+        POIs in a projected CRS.
+    landuse : geopandas.GeoDataFrame or None
+        Land-use polygons, e.g. the output of `merge_landuse_type`.
+    poi_category_col : str or None
+        POI category column; None gives a single `poi_count` column.
+    landuse_category_col : str, default 'landuse'
+        Land-use category column.
+    origin : (float, float), default (0, 0)
+        Grid origin in CRS coordinates.
+    tile_cells, n_jobs
+        See `landuse_area_by_grid`.
+    with_geometry : bool, default False
+        If True, return a GeoDataFrame with the cell polygons.
+
+    Returns
+    -------
+    pandas.DataFrame or geopandas.GeoDataFrame
+        Indexed by (col, row).
+    """
+    assert (pois is not None) or (landuse is not None), 'Provide pois and/or landuse'
+    if (pois is not None) and (landuse is not None):
+        assert pois.crs.equals(landuse.crs), 'pois and landuse must share a CRS'
+
+    tables = []
+    if pois is not None:
+        tables.append(count_points_by_grid(pois, cell_size, poi_category_col, origin).add_prefix('poi_'))
+    if landuse is not None:
+        tables.append(landuse_area_by_grid(
+            landuse, cell_size, landuse_category_col, origin, tile_cells, n_jobs).add_prefix('landuse_'))
+
+    features = pd.concat(tables, axis=1).fillna(0).sort_index()
+    # the outer join turns counts into floats where a cell lacks POIs
+    poi_cols = [c for c in features.columns if c.startswith('poi_')]
+    features[poi_cols] = features[poi_cols].astype(np.int64)
+
+    if with_geometry:
+        crs = (pois if pois is not None else landuse).crs
+        x0 = origin[0] + features.index.get_level_values('col').to_numpy() * cell_size
+        y0 = origin[1] + features.index.get_level_values('row').to_numpy() * cell_size
+        features = gpd.GeoDataFrame(
+            features, geometry=shapely.box(x0, y0, x0 + cell_size, y0 + cell_size), crs=crs)
+
+    return features
+# ============================================================================================
@@ -0,0 +1,230 @@
+"""
+Per-step metrics and output control for the preprocessing functions.
+
+Functions decorated with `instrumented` report one record per call to every
+registered sink: wall time, CPU time, RSS change, input/output sizes
+(nodes and edges for graphs, rows for data frames) and items per second.
+With no sink registered the decorator calls straight through.
+
+`set_quiet(True)` (or the environment variable OSM_PROCESS_QUIET=1) turns off
+the tqdm progress bars and the printed messages of the package.
+
+    from osm_process_tool import instrument
+    sink = instrument.MemorySink()
+    instrument.add_sink(sink)
+    instrument.set_quiet(True)
+"""
+import functools
+import json
+import logging
+import os
+import sys
+import threading
+import time
+
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from ._lazy import lazy_import
+
+tqdm = lazy_import('tqdm')
+
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
+
+
+logger = logging.getLogger('osm_process_tool')
+
+_SINKS: List[Any] = []
+_QUIET = os.environ.get('OSM_PROCESS_QUIET', '').lower() in ('1', 'true', 'yes')
+_LOCK = threading.Lock()
+
+
+# ============================================================================================
+# Sinks
+# ============================================================================================
+class LoggingSink:
+    """
+    Send each record to a `logging` logger as one line.
+    """
+
+    def __init__(self, logger: Optional[logging.Logger] = None, level: int = logging.INFO):
+        self.logger = logger if logger is not None else logging.getLogger('osm_process_tool.metrics')
+        self.level = level
+
+    def emit(self, record: Dict[str, Any]) -> None:
+        fields = ' '.join(f'{k}={v}' for k, v in record.items() if k != 'step')
+        self.logger.log(self.level, '%s %s', record['step'], fields)
+
+
+class JsonLinesSink:
+    """
+    Append each record as a JSON line to `path`.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def emit(self, record: Dict[str, Any]) -> None:
+        with _LOCK, open(self.path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(record, default=str) + '\n')
+
+
+class MemorySink:
+    """
+    Keep records in memory under `.records`.
+    """
+
+    def __init__(self):
+        self.records: List[Dict[str, Any]] = []
+
+    def emit(self, record: Dict[str, Any]) -> None:
+        self.records.append(record)
+# ============================================================================================
+# Configuration
+# ============================================================================================
+def add_sink(sink: Any) -> None:
+    """
+    Register a sink; any object with an `emit(record)` method.
+    """
+    _SINKS.append(sink)
+
+
+def remove_sink(sink: Any) -> None:
+    _SINKS.remove(sink)
+
+
+def clear_sinks() -> None:
+    _SINKS.clear()
+
+
+def set_quiet(quiet: bool = True) -> None:
+    """
+    Turn progress bars and printed messages off (True) or on (False).
+    """
+    global _QUIET
+    _QUIET = bool(quiet)
+
+
+def is_quiet() -> bool:
+    return _QUIET
+# ============================================================================================
+# Output helpers used across the package
+# ============================================================================================
+def progress(iterable: Iterable, **kwargs) -> Iterable:
+    """
+    `tqdm.tqdm(iterable, **kwargs)`, or the bare iterable in quiet mode.
+    """
+    if _QUIET:
+        return iterable
+    return tqdm.tqdm(iterable, **kwargs)
+
+
+def echo(*args, **kwargs) -> None:
+    """
+    `print(*args, **kwargs)`, unless in quiet mode.
+    """
+    if not _QUIET:
+        print(*args, **kwargs)
+# ============================================================================================
+# Step metrics
+# ============================================================================================
+def _current_rss_kib() -> Optional[int]:
+    # Resident set size right now: /proc on Linux, psutil elsewhere if installed
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') // 1024
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        import psutil
+    except ImportError:
+        return None
+    return psutil.Process().memory_info().rss // 1024
+
+
+def _peak_rss_kib() -> Optional[int]:
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS, KiB elsewhere
+    return peak // 1024 if sys.platform == 'darwin' else peak
+
+
+def _describe(obj: Any, prefix: str) -> Dict[str, int]:
+    # Sizes of a graph, a data frame, or the first of a tuple of them
+    if isinstance(obj, tuple) and obj:
+        sizes = {}
+        for i, item in enumerate(obj):
+            sizes.update(_describe(item, f'{prefix}{i}_' if len(obj) > 1 else prefix))
+        return sizes
+    if hasattr(obj, 'number_of_nodes') and hasattr(obj, 'number_of_edges'):
+        return {f'{prefix}nodes': obj.number_of_nodes(), f'{prefix}edges': obj.number_of_edges()}
+    if hasattr(obj, 'shape') and hasattr(obj, 'columns'):
+        return {f'{prefix}rows': int(obj.shape[0])}
+    return {}
+
+
+def instrumented(func: Optional[Callable] = None, *, step: Optional[str] = None) -> Callable:
+    """
+    Decorator emitting one metrics record per call to the registered sinks.
+
+    The record holds:
+      - step                : `step`, or `module.function` by default
+      - wall_time_s, cpu_time_s
+      - rss_start_kib       : resident memory when the call starts
+      - rss_delta_kib       : resident memory at the end minus at the start;
+                              negative if the call freed memory
+      - peak_rss_growth_kib : how far the call raised the process-wide peak
+                              RSS (ru_maxrss); 0 when it stayed below an
+                              earlier peak, so it is not the call's own peak
+      - input_* / output_*  : node and edge counts for graphs, rows for data frames
+      - items_per_s         : input edges (or rows) processed per second
+
+    Usable as `@instrumented` or `@instrumented(step='name')`.
+    """
+    if func is None:
+        return functools.partial(instrumented, step=step)
+
+    name = step or f'{func.__module__.rsplit(".", 1)[-1]}.{func.__name__}'
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if not _SINKS:
+            return func(*args, **kwargs)
+
+        inputs = _describe(args[0], 'input_') if args else {}
+        rss0, peak0 = _current_rss_kib(), _peak_rss_kib()
+        t_wall, t_cpu = time.perf_counter(), time.process_time()
+
+        result = func(*args, **kwargs)
+
+        wall = time.perf_counter() - t_wall
+        cpu = time.process_time() - t_cpu
+        rss1, peak1 = _current_rss_kib(), _peak_rss_kib()
+
+        n_items = inputs.get('input_edges', inputs.get('input_rows'))
+        record = {
+            'step': name,
+            'timestamp': time.time(),
+            'wall_time_s': wall,
+            'cpu_time_s': cpu,
+            'rss_start_kib': rss0,
+            'rss_delta_kib': None if rss0 is None else rss1 - rss0,
+            'peak_rss_growth_kib': None if peak0 is None else peak1 - peak0,
+            **inputs,
+            **_describe(result, 'output_'),
+            'items_per_s': (n_items / wall) if (n_items is not None and wall > 0) else None,
+        }
+        for sink in list(_SINKS):
+            try:
+                sink.emit(record)
+            except Exception:
+                # A broken sink must not break the pipeline
+                logger.exception('Metrics sink %r failed', sink)
+
+        return result
+
+    return wrapper
+# ============================================================================================
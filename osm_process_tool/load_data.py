@@ -1,20 +1,27 @@
+import os
 import pathlib
-import pandas as pd
 
-DATABASE_FOLDER = r'C:\Users\Wei Zhou\Documents\zhouwei file\Github-Project\VeTool-Code-Template\osm_extraction\tags'
-DATABASE_FOLDER = pathlib.Path(DATABASE_FOLDER)
+from ._lazy import lazy_import
 
-def load_osm_tag_category(tag_name):
+pd = lazy_import('pandas')
 
-    assert tag_name in ['amenity', 'shop', 'leisure'], f'Not supported tag name: {tag_name}'
+# Default tag tables shipped with the repository; override with $OSM_TAG_FOLDER
+DEFAULT_DATABASE_FOLDER = pathlib.Path(__file__).resolve().parents[1] / 'data' / 'osm_tags'
 
-    path = DATABASE_FOLDER / f'{tag_name}.xlsx'
-    data = pd.read_excel(path, sheet_name=tag_name)
 
-    return data
-# ================================================================
+def get_database_folder():
+    """
+    Folder holding the OSM tag tables, resolved when called rather than at import.
+    """
+    return pathlib.Path(os.environ.get('OSM_TAG_FOLDER', DEFAULT_DATABASE_FOLDER))
 
 
+def load_osm_tag_category(tag_name):
 
+    assert tag_name in ['amenity', 'shop', 'leisure'], f'Not supported tag name: {tag_name}'
 
+    path = get_database_folder() / f'{tag_name}.xlsx'
+    data = pd.read_excel(path, sheet_name=tag_name)
 
+    return data
+# ================================================================
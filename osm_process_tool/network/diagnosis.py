@@ -1,8 +1,18 @@
-import pandas as pd
+from __future__ import annotations
+
 import networkx as nx
-from typing import Union
+from typing import TYPE_CHECKING, Union
+
+from .._lazy import lazy_import
+from ..instrument import echo, instrumented, is_quiet
+
+if TYPE_CHECKING:
+    import pandas as pd
 
+pd = lazy_import('pandas')
 
+
+@instrumented
 def get_giant_component(
     graph: Union[nx.Graph, nx.DiGraph]
 ) -> Union[nx.Graph, nx.DiGraph]:
@@ -45,6 +55,7 @@ def get_giant_component(
 #
 #     return graph
 # # ============================================================================================
+@instrumented
 def print_graph_info(graph: Union[nx.Graph, nx.DiGraph]) -> None:
     """
     Print summary statistics of the graph and its largest component.
@@ -54,7 +65,11 @@ def print_graph_info(graph: Union[nx.Graph, nx.DiGraph]) -> None:
     graph : networkx.Graph or networkx.DiGraph
         Input graph.
     """
-    print('\nIs directed: ', graph.is_directed(),
+    # Nothing to show in quiet mode; skip the component computations too
+    if is_quiet():
+        return
+
+    echo('\nIs directed: ', graph.is_directed(),
         '\nNo. of nodes: ', graph.number_of_nodes(),
         '\nNo. of edges: ', graph.number_of_edges(),
         '\nNo. of isolated nodes: ', len(list(nx.isolates(graph))),
@@ -63,19 +78,20 @@ def print_graph_info(graph: Union[nx.Graph, nx.DiGraph]) -> None:
     # Largest component stats
     giant = get_giant_component(graph)
     # Get the giant component
-    print('\nThe giant component: ',
+    echo('\nThe giant component: ',
         '\n\tNo. of nodes: ', giant.number_of_nodes(),
         '\n\tNo. of edges: ', giant.number_of_edges())
 
     # Component counts
     if graph.is_directed():
         count = nx.number_weakly_connected_components(graph)
-        print(f"\nNo. of weakly connected components: {count}")
+        echo(f"\nNo. of weakly connected components: {count}")
     else:
         count = nx.number_connected_components(graph)
-        print(f"No. of connected components: {count}")
+        echo(f"No. of connected components: {count}")
 # ============================================================================================
 #%%
+@instrumented
 def compute_travel_statistics(
     graph: Union[nx.Graph, nx.DiGraph]
 ) -> pd.DataFrame:
@@ -0,0 +1,245 @@
+import pickle
+import pathlib
+import numpy as np
+import networkx as nx
+import shapely
+
+from scipy.spatial import cKDTree
+from shapely.geometry import LineString, MultiLineString
+
+from typing import Any, Dict, List, Tuple, Union
+
+
+class NetworkLocator:
+    """
+    Spatial index over a processed network for batch snapping of points.
+
+    Nodes are indexed by a KD-tree on their projected coordinates
+    (`proj_x`/`proj_y`); edges are indexed by an STRtree on their projected
+    geometries. All queries take coordinate arrays and answer in one
+    vectorized call.
+
+    The locator can be written to disk with `save` and restored with `load`,
+    so workers can share one index instead of rebuilding it from the graph.
+
+    Attributes
+    ----------
+    node_ids : numpy.ndarray
+        Node IDs, aligned with the KD-tree points.
+    node_xy : numpy.ndarray
+        (n, 2) array of projected node coordinates.
+    edge_ids : list of tuple
+        Edge IDs (u, v) or (u, v, key) for multigraphs, aligned with the STRtree.
+    edge_geoms : numpy.ndarray
+        Shapely edge geometries in the projected CRS.
+    edge_reversed : numpy.ndarray
+        True where an edge geometry runs from v to u rather than from u to v.
+    crs : str | int | dict | None
+        CRS of the coordinates, taken from the graph-level 'crs' attribute.
+    """
+
+    def __init__(
+        self,
+        node_ids: np.ndarray,
+        node_xy: np.ndarray,
+        edge_ids: List[Tuple[Any, ...]],
+        edge_geoms: np.ndarray,
+        crs: Union[str, int, Dict, None] = None,
+    ):
+        self.node_ids = np.asarray(node_ids)
+        self.node_xy = np.asarray(node_xy, dtype=float).reshape(-1, 2)
+        self.edge_ids = list(edge_ids)
+        self.edge_geoms = np.asarray(edge_geoms, dtype=object)
+        self.crs = crs
+
+        assert len(self.node_ids) == len(self.node_xy), "node_ids and node_xy must align"
+        assert len(self.edge_ids) == len(self.edge_geoms), "edge_ids and edge_geoms must align"
+
+        self.edge_reversed = self._edge_reversed()
+
+        self._kdtree = cKDTree(self.node_xy) if len(self.node_xy) > 0 else None
+        self._strtree = shapely.STRtree(self.edge_geoms) if len(self.edge_geoms) > 0 else None
+    # --------------------------------------------------------------------------------------
+    def _edge_reversed(self) -> np.ndarray:
+        # Undirected graphs keep geometries in either orientation; compare each
+        # geometry's first vertex with the coordinates of u and v
+        reversed_ = np.zeros(len(self.edge_ids), dtype=bool)
+        if len(self.edge_ids) == 0:
+            return reversed_
+
+        node_index = {n: i for i, n in enumerate(self.node_ids)}
+        uv = np.array(
+            [(node_index.get(e[0], -1), node_index.get(e[1], -1)) for e in self.edge_ids],
+            dtype=np.int64).reshape(-1, 2)
+        known = (uv >= 0).all(axis=1)
+
+        coords, idx = shapely.get_coordinates(self.edge_geoms, return_index=True)
+        first = np.concatenate([[0], np.flatnonzero(np.diff(idx)) + 1])
+        start = np.full((len(self.edge_ids), 2), np.nan)
+        start[idx[first]] = coords[first]
+
+        d_u = np.hypot(*(start[known] - self.node_xy[uv[known, 0]]).T)
+        d_v = np.hypot(*(start[known] - self.node_xy[uv[known, 1]]).T)
+        reversed_[known] = d_v < d_u
+        return reversed_
+    # --------------------------------------------------------------------------------------
+    @classmethod
+    def from_graph(
+        cls,
+        G: nx.Graph,
+        node_attr_x: str = "proj_x",
+        node_attr_y: str = "proj_y",
+        edge_attr_geom: str = "geometry",
+    ) -> "NetworkLocator":
+        """
+        Build a locator from a processed graph.
+
+        Nodes lacking projected coordinates and edges lacking a LineString /
+        MultiLineString geometry are left out of the index.
+
+        Parameters
+        ----------
+        G : nx.Graph | nx.DiGraph | nx.MultiGraph | nx.MultiDiGraph
+            Processed graph, e.g. the output of `reproject_network_geometry`.
+        node_attr_x : str, default "proj_x"
+            Node attribute key for projected x-coordinate.
+        node_attr_y : str, default "proj_y"
+            Node attribute key for projected y-coordinate.
+        edge_attr_geom : str, default "geometry"
+            Edge attribute key for the projected Shapely geometry.
+
+        Returns
+        -------
+        NetworkLocator
+        """
+        # 1) Collect nodes carrying projected coordinates
+        node_ids, node_xy = [], []
+        for n, data in G.nodes(data=True):
+            x, y = data.get(node_attr_x), data.get(node_attr_y)
+            if (x is None) or (y is None):
+                continue
+            node_ids.append(n)
+            node_xy.append((x, y))
+
+        # 2) Collect edges carrying a line geometry
+        edge_iter = G.edges(keys=True, data=True) if G.is_multigraph() else G.edges(data=True)
+        edge_ids, edge_geoms = [], []
+        for *eid, data in edge_iter:
+            geom = data.get(edge_attr_geom)
+            if isinstance(geom, (LineString, MultiLineString)):
+                edge_ids.append(tuple(eid))
+                edge_geoms.append(geom)
+
+        node_id_arr = np.empty(len(node_ids), dtype=object)
+        node_id_arr[:] = node_ids
+
+        return cls(
+            node_ids = node_id_arr,
+            node_xy = np.array(node_xy, dtype=float).reshape(-1, 2),
+            edge_ids = edge_ids,
+            edge_geoms = np.array(edge_geoms, dtype=object),
+            crs = G.graph.get("crs", None))
+    # --------------------------------------------------------------------------------------
+    def nearest_node(
+        self,
+        x: Union[float, np.ndarray],
+        y: Union[float, np.ndarray],
+        max_distance: float = np.inf,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Find the nearest node for each query point.
+
+        Parameters
+        ----------
+        x, y : float or array-like
+            Projected coordinates of the query points.
+        max_distance : float, default inf
+            Points farther than this from every node get no match.
+
+        Returns
+        -------
+        node_ids : numpy.ndarray
+            Nearest node ID per point (None where unmatched).
+        distances : numpy.ndarray
+            Distance to the nearest node (inf where unmatched).
+        """
+        assert self._kdtree is not None, "Locator holds no nodes"
+
+        xy = np.column_stack([np.atleast_1d(x), np.atleast_1d(y)]).astype(float)
+        dist, idx = self._kdtree.query(xy, k=1, distance_upper_bound=max_distance)
+
+        # cKDTree reports misses with index == number of points
+        matched = idx < len(self.node_ids)
+        node_ids = np.full(len(xy), None, dtype=object)
+        node_ids[matched] = self.node_ids[idx[matched]]
+
+        return node_ids, dist
+    # --------------------------------------------------------------------------------------
+    def nearest_edge(
+        self,
+        x: Union[float, np.ndarray],
+        y: Union[float, np.ndarray],
+        max_distance: float = None,
+    ) -> Tuple[List[Any], np.ndarray, np.ndarray]:
+        """
+        Find the nearest edge for each query point, and the position of the
+        projected point along that edge.
+
+        Parameters
+        ----------
+        x, y : float or array-like
+            Projected coordinates of the query points.
+        max_distance : float or None
+            Points farther than this from every edge get no match.
+
+        Returns
+        -------
+        edge_ids : list
+            Nearest edge ID per point (None where unmatched).
+        distances : numpy.ndarray
+            Distance to the nearest edge (inf where unmatched).
+        positions : numpy.ndarray
+            Distance along the edge, measured from its first node `edge_id[0]`,
+            to the point's projection on it (NaN where unmatched). Geometries
+            stored from v to u are measured from their last vertex.
+        """
+        assert self._strtree is not None, "Locator holds no edges"
+
+        points = shapely.points(np.atleast_1d(x), np.atleast_1d(y))
+
+        # 1) Nearest edge per point; ties resolve to the first hit
+        (pt_idx, edge_idx), dist = self._strtree.query_nearest(
+            points, max_distance=max_distance, return_distance=True, all_matches=False)
+
+        # 2) Scatter matches back to query order
+        distances = np.full(len(points), np.inf)
+        positions = np.full(len(points), np.nan)
+        edge_ids = [None] * len(points)
+
+        distances[pt_idx] = dist
+        geoms = self.edge_geoms[edge_idx]
+        pos = shapely.line_locate_point(geoms, points[pt_idx])
+        positions[pt_idx] = np.where(self.edge_reversed[edge_idx], shapely.length(geoms) - pos, pos)
+        for p, e in zip(pt_idx, edge_idx):
+            edge_ids[p] = self.edge_ids[e]
+
+        return edge_ids, distances, positions
+    # --------------------------------------------------------------------------------------
+    def save(self, path: Union[str, pathlib.Path]) -> None:
+        """
+        Serialize the locator, including its built KD-tree, to `path`.
+        """
+        with open(path, 'wb') as f:
+            pickle.dump(self, f, protocol=pickle.HIGHEST_PROTOCOL)
+    # --------------------------------------------------------------------------------------
+    @staticmethod
+    def load(path: Union[str, pathlib.Path]) -> "NetworkLocator":
+        """
+        Load a locator previously written with `save`.
+        """
+        with open(path, 'rb') as f:
+            locator = pickle.load(f)
+
+        assert isinstance(locator, NetworkLocator), f'Not a NetworkLocator file: {path}'
+        return locator
+# ============================================================================================
@@ -1,7 +1,10 @@
 import networkx as nx
 from typing import Any, Iterable, Union
 
+from ..instrument import instrumented
 
+
+@instrumented
 def remove_node_edge_attrs(
     G: nx.Graph,
     node_attrs: Union[str, Iterable[str]],
@@ -50,6 +53,7 @@ def remove_node_edge_attrs(
 
     return G2
 # ======================================================================================
+@instrumented
 def remove_edge_by_attr_value(
     G: nx.Graph,
     attr_name: str,
@@ -103,4 +107,58 @@ def remove_edge_by_attr_value(
             G2.remove_nodes_from(isolated)
 
     return G2
-# =====================================================================================
\ No newline at end of file
+# =====================================================================================
+def _tag_text(value: Any) -> Union[str, None]:
+    # List-valued tags (merged by osmnx simplification) as one comma-joined string
+    if isinstance(value, list):
+        return ','.join(map(str, value))
+    if isinstance(value, str):
+        return value
+    return None
+
+
+@instrumented
+def normalize_edge_tags(
+    G: nx.Graph,
+    missing: str = 'unknown'
+) -> nx.Graph:
+    """
+    Return a shallow copy of G with the walking-network tags reduced to
+    single values, as in the attribute clean-up of
+    `tutorials/preprocess/network.ipynb`:
+
+      - highway          : first value of a list-valued tag
+      - crossing         : 'signal' if any value mentions a signal, else 'crossing'
+      - bridge, tunnel   : 'no' if any value contains 'no', else 'yes'
+
+    Edges lacking a tag (e.g. those added by `process_isolated_nodes`), or
+    holding a non-string value, get `missing`.
+
+    Parameters
+    ----------
+    G : nx.Graph or nx.DiGraph or nx.MultiGraph or nx.MultiDiGraph
+        The input graph.
+    missing : str, default 'unknown'
+        Value written for absent tags.
+
+    Returns
+    -------
+    G2 : same type as G
+        A shallow copy of G with normalized 'highway', 'crossing', 'bridge'
+        and 'tunnel' edge attributes.
+    """
+    G2 = G.copy()
+
+    for _, _, attrs in G2.edges(data=True):
+        value = _tag_text(attrs.get('highway'))
+        attrs['highway'] = value.split(',')[0] if value else missing
+
+        value = _tag_text(attrs.get('crossing'))
+        attrs['crossing'] = missing if value is None else ('signal' if 'signal' in value else 'crossing')
+
+        for attr_name in ['bridge', 'tunnel']:
+            value = _tag_text(attrs.get(attr_name))
+            attrs[attr_name] = missing if value is None else ('no' if 'no' in value else 'yes')
+
+    return G2
+# =====================================================================================
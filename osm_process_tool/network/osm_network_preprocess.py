@@ -1,17 +1,26 @@
+from __future__ import annotations
 
-import tqdm
-import pyproj
 import networkx as nx
-import pandas as pd
-import geopandas as gpd
 
-from shapely.ops import transform
-from shapely.geometry import Point, LineString, MultiLineString
+from typing import TYPE_CHECKING, Union, Any, Callable, Dict, Tuple, List, Optional
 
-from typing import Union, Any, Dict, Tuple, List, Optional
-from shapely.geometry.base import BaseGeometry
+from .._lazy import lazy_import
+from ..instrument import echo, instrumented, progress
 
+if TYPE_CHECKING:
+    import geopandas as gpd
+    from shapely.geometry.base import BaseGeometry
 
+# Heavy dependencies are imported on first use to keep module import cheap
+pyproj = lazy_import('pyproj')
+np = lazy_import('numpy')
+pd = lazy_import('pandas')
+gpd = lazy_import('geopandas')
+shapely = lazy_import('shapely')
+ops = lazy_import('shapely.ops')
+
+
+@instrumented
 def remove_nodes_outside_boundary(
     G: nx.MultiDiGraph,
     projected_crs: Union[str, int, Dict],
@@ -56,7 +65,7 @@ def remove_nodes_outside_boundary(
 
     # 3) Identify nodes to remove
     nodes_to_remove = []
-    for node, data in tqdm.tqdm(G2.nodes(data=True), desc="Removing nodes outside boundary"):
+    for node, data in progress(G2.nodes(data=True), desc="Removing nodes outside boundary"):
 
         lon = data.get(node_attr_x)
         lat = data.get(node_attr_y)
@@ -68,7 +77,7 @@ def remove_nodes_outside_boundary(
 
         # 3b) Reproject the lon/lat point into the projected CRS
         x_proj, y_proj = transformer.transform(lon, lat)
-        pt = Point(x_proj, y_proj)
+        pt = shapely.Point(x_proj, y_proj)
 
         # 3c) If the point lies outside the boundary polygon, mark for removal
         if not boundary.contains(pt):
@@ -82,6 +91,7 @@ def remove_nodes_outside_boundary(
 
     return G2
 # =============================================================================================================
+@instrumented
 def reproject_network_geometry(
     G: nx.MultiDiGraph,
     projected_crs: Union[str, dict, int],
@@ -157,7 +167,7 @@ def reproject_network_geometry(
 
     # 3) Reproject node coordinates
     removed_node_list = []
-    for n, node_data in tqdm.tqdm(G2.nodes(data=True), desc="Step 1: reprojecting nodes"):
+    for n, node_data in progress(G2.nodes(data=True), desc="Step 1: reprojecting nodes"):
 
         node_data_new = node_data.copy()
 
@@ -181,19 +191,19 @@ def reproject_network_geometry(
     # 4) Remove nodes lacking valid coords (and their incident edges)
     if node_non_geom_remove and (len(removed_node_list) > 0):
         G2.remove_nodes_from(removed_node_list)
-        print(f"Removed nodes with invalid coordinates: {len(removed_node_list)}")
+        echo(f"Removed nodes with invalid coordinates: {len(removed_node_list)}")
 
 
     # 5) compute edge lengths
-    for u, v, k, edge_data in tqdm.tqdm(G2.edges(keys=True, data=True), desc="Step 2: reprojecting edge"):
+    for u, v, k, edge_data in progress(G2.edges(keys=True, data=True), desc="Step 2: reprojecting edge"):
 
         edge_data_new = edge_data.copy()
         edge_geom = edge_data_new.get(edge_attr_geom)
 
         # skip non‐line geometries
-        if isinstance(edge_geom, (LineString, MultiLineString)):
+        if isinstance(edge_geom, (shapely.LineString, shapely.MultiLineString)):
             # valid geometry: project it
-            proj_geom = transform(transformer.transform, edge_geom)
+            proj_geom = ops.transform(transformer.transform, edge_geom)
             # Overwrite the geometry attribute with the reprojected version
             edge_data_new.update({
                 edge_attr_len:  proj_geom.length,
@@ -206,7 +216,7 @@ def reproject_network_geometry(
                 # fallback to straight line between the two nodes
                 x1, y1 = G2.nodes[u].get(node_attr_proj_x), G2.nodes[u].get(node_attr_proj_y)
                 x2, y2 = G2.nodes[v].get(node_attr_proj_x), G2.nodes[v].get(node_attr_proj_y)
-                proj_geom = LineString([(x1, y1), (x2, y2)])
+                proj_geom = shapely.LineString([(x1, y1), (x2, y2)])
 
                 edge_data_new.update({
                     edge_attr_len : proj_geom.length,
@@ -224,6 +234,7 @@ def reproject_network_geometry(
 
     return G2
 # =============================================================================================================
+@instrumented
 def collapse_multidigraph_to_graph(
     G_multi: nx.MultiDiGraph,
     weight: str
@@ -264,7 +275,7 @@ def collapse_multidigraph_to_graph(
     best: Dict[Tuple[Any, Any], Tuple[float, Dict[str, Any]]] = {}
 
     # No edge key for this multigraph
-    for u, v, k, data in tqdm.tqdm(G_multi.edges(keys=True, data=True), desc="Selecting minimal edges"):
+    for u, v, k, data in progress(G_multi.edges(keys=True, data=True), desc="Selecting minimal edges"):
         # 2a) Skip self-loops
         if u == v:
             continue
@@ -290,6 +301,7 @@ def collapse_multidigraph_to_graph(
 
     return G
 # =============================================================================================================
+@instrumented
 def process_isolated_nodes(
     G: nx.Graph,
     threshold: Optional[float] = None,
@@ -327,13 +339,13 @@ def process_isolated_nodes(
 
     # 1) If no isolated nodes, nothing to do
     if not isolated_nodes:
-        print('No isolated nodes to process.')
+        echo('No isolated nodes to process.')
         return G2  # nothing to do
 
     # If no threshold specified, drop all isolated nodes
     if threshold is None:
         G2.remove_nodes_from(isolated_nodes)
-        print('Dropped all isolated nodes.')
+        echo('Dropped all isolated nodes.')
         return G2
 
 
@@ -370,14 +382,14 @@ def process_isolated_nodes(
     # print(joined_node.columns)
 
     # 4) For each isolated node, either connect or drop
-    for idx, row in tqdm.tqdm(joined_node.iterrows(), desc="Connecting isolated nodes (total edges: {})".format(len(joined_node))):
+    for idx, row in progress(joined_node.iterrows(), desc="Connecting isolated nodes (total edges: {})".format(len(joined_node))):
         iso_node = row['node_id_left']
         nbr_node = row['node_id_right']
         dist = row['distance_m']
 
         # 4a) If the distance is within threshold, connect with a straight line
         G2.add_edge(iso_node, nbr_node, **{
-            edge_attr_geom: LineString([
+            edge_attr_geom: shapely.LineString([
                 iso_node_gdf['geometry'].loc[iso_node],
                 noniso_node_gdf['geometry'].loc[nbr_node]]),
             edge_attr_len: dist,})
@@ -386,10 +398,179 @@ def process_isolated_nodes(
     remaining_isolated = list(nx.isolates(G2))
     if remaining_isolated:
         G2.remove_nodes_from(remaining_isolated)
-        print(f'Dropped remaining isolated nodes: {len(remaining_isolated)}')
+        echo(f'Dropped remaining isolated nodes: {len(remaining_isolated)}')
+
+    return G2
+# ============================================================================================================
+@instrumented
+def simplify_degree2_nodes(
+    G: nx.Graph,
+    node_attr_x: str = "proj_x",
+    node_attr_y: str = "proj_y",
+    edge_attr_geom: str = "geometry",
+    edge_attr_len: str = "length_m",
+    attr_rules: Optional[Dict[str, Union[str, Callable[[List[Any]], Any]]]] = None,
+    default_rule: Union[str, Callable[[List[Any]], Any]] = "first",
+) -> nx.Graph:
+    """
+    Merge chains of degree-2 nodes into single edges.
+
+    Each maximal chain a - n1 - ... - nk - b, whose interior nodes have
+    degree 2 and whose ends do not, is replaced by one edge (a, b):
+      - geometries are oriented along the chain and concatenated,
+      - `edge_attr_len` is summed,
+      - every other attribute is merged by `attr_rules` / `default_rule`.
+
+    A chain is kept unchanged if merging it would create a self-loop or an
+    edge parallel to an existing one (nx.Graph cannot hold both), and so are
+    isolated cycles. Shortest-path distances between the retained nodes are
+    therefore identical to those in G.
+
+    Parameters
+    ----------
+    G : nx.Graph
+        Undirected simple graph, e.g. the output of `collapse_multidigraph_to_graph`.
+    node_attr_x : str, default "proj_x"
+        Node attribute key for projected x-coordinate.
+    node_attr_y : str, default "proj_y"
+        Node attribute key for projected y-coordinate.
+    edge_attr_geom : str, default "geometry"
+        Edge attribute key for the projected Shapely geometry.
+    edge_attr_len : str, default "length_m"
+        Edge attribute key for length in metres.
+    attr_rules : dict or None
+        Per-attribute merge rule. A rule is one of "first", "last", "sum",
+        "min", "max", "list" (distinct values in chain order), or a callable
+        taking the list of values along the chain.
+    default_rule : str or callable, default "first"
+        Rule for attributes not listed in `attr_rules`.
+
+    Returns
+    -------
+    nx.Graph
+        A simplified copy of G.
+    """
+    assert not (G.is_directed() or G.is_multigraph()), "Input graph must be a networkx.Graph"
+
+    rules = {
+        "first": lambda vals: vals[0],
+        "last": lambda vals: vals[-1],
+        "sum": sum,
+        "min": min,
+        "max": max,
+        "list": lambda vals: [x for i, x in enumerate(vals) if x not in vals[:i]],
+    }
+    attr_rules = {k: rules[r] if isinstance(r, str) else r for k, r in (attr_rules or {}).items()}
+    default_rule = rules[default_rule] if isinstance(default_rule, str) else default_rule
+
+    # 1) Flatten the graph into index arrays
+    node_ids = list(G.nodes())
+    node_index = {n: i for i, n in enumerate(node_ids)}
+    edge_list = list(G.edges(data=True))
+    eu = np.fromiter((node_index[u] for u, _, _ in edge_list), dtype=np.int64, count=len(edge_list))
+    ev = np.fromiter((node_index[v] for _, v, _ in edge_list), dtype=np.int64, count=len(edge_list))
+
+    # 2) Node → incident edges, in CSR layout
+    inc_node = np.concatenate([eu, ev])
+    inc_edge = np.concatenate([np.arange(len(eu)), np.arange(len(eu))])
+    order = np.argsort(inc_node, kind="stable")
+    inc_edge = inc_edge[order].tolist()
+    degree = np.bincount(inc_node, minlength=len(node_ids))
+    offset = np.concatenate([[0], np.cumsum(degree)]).tolist()
+
+    # Nodes with self-loops are never interstitial
+    interstitial = degree == 2
+    interstitial[eu[eu == ev]] = False
+    interstitial = interstitial.tolist()
+    eu, ev = eu.tolist(), ev.tolist()
+
+    # 3) Walk every chain starting from a non-interstitial end
+    visited = [False] * len(edge_list)
+    pairs = {frozenset((u, v)) for u, v in zip(eu, ev) if not (interstitial[u] or interstitial[v])}
+    chains = []  # (start, end, [(edge, forward), ...])
+
+    for s in range(len(node_ids)):
+        if interstitial[s]:
+            continue
+        for e in inc_edge[offset[s]:offset[s + 1]]:
+            if visited[e]:
+                continue
+            cur = ev[e] if eu[e] == s else eu[e]
+            if not interstitial[cur]:
+                continue
+
+            path = [(e, eu[e] == s)]
+            visited[e] = True
+            while interstitial[cur]:
+                e1, e2 = inc_edge[offset[cur]], inc_edge[offset[cur] + 1]
+                e = e2 if e1 == path[-1][0] else e1
+                path.append((e, eu[e] == cur))
+                visited[e] = True
+                cur = ev[e] if eu[e] == cur else eu[e]
+
+            # Skip chains that would become a self-loop or a parallel edge
+            key = frozenset((s, cur))
+            if s == cur or key in pairs:
+                continue
+            pairs.add(key)
+            chains.append((s, cur, path))
+
+    # 4) Build the simplified graph in one pass
+    G2 = nx.Graph()
+    G2.graph.update(G.graph)
+
+    removed_nodes, merged_edges = set(), set()
+    for _, _, path in chains:
+        merged_edges.update(e for e, _ in path)
+        # interior nodes are where each edge after the first starts
+        removed_nodes.update(eu[e] if fwd else ev[e] for e, fwd in path[1:])
+
+    G2.add_nodes_from((node_ids[i], G.nodes[node_ids[i]].copy())
+                      for i in range(len(node_ids)) if i not in removed_nodes)
+    G2.add_edges_from((u, v, data.copy())
+                      for e, (u, v, data) in enumerate(edge_list) if e not in merged_edges)
+
+    def _oriented_coords(e, forward):
+        # Coordinates of edge e, in chain direction
+        u, v, data = edge_list[e]
+        geom = data.get(edge_attr_geom)
+        pu, pv = G.nodes[u], G.nodes[v]
+        if isinstance(geom, (shapely.LineString, shapely.MultiLineString)):
+            coords = shapely.get_coordinates(geom)
+            # geometry may be stored in either direction; compare to node u
+            d_start = np.hypot(coords[0, 0] - pu.get(node_attr_x, np.nan), coords[0, 1] - pu.get(node_attr_y, np.nan))
+            d_end = np.hypot(coords[-1, 0] - pu.get(node_attr_x, np.nan), coords[-1, 1] - pu.get(node_attr_y, np.nan))
+            if d_end < d_start:
+                coords = coords[::-1]
+        else:
+            coords = np.array([[pu.get(node_attr_x), pu.get(node_attr_y)],
+                               [pv.get(node_attr_x), pv.get(node_attr_y)]], dtype=float)
+        return coords if forward else coords[::-1]
+
+    for s, t, path in progress(chains, desc="Merging degree-2 chains"):
+        data_list = [edge_list[e][2] for e, _ in path]
+
+        coords = [_oriented_coords(e, fwd) for e, fwd in path]
+        coords = np.concatenate([coords[0]] + [c[1:] for c in coords[1:]])
+
+        merged = {}
+        for attr in dict.fromkeys(k for d in data_list for k in d):
+            if attr in (edge_attr_geom, edge_attr_len):
+                continue
+            vals = [d[attr] for d in data_list if attr in d]
+            merged[attr] = attr_rules.get(attr, default_rule)(vals)
+        merged[edge_attr_len] = sum(d.get(edge_attr_len, np.nan) for d in data_list)
+        merged[edge_attr_geom] = shapely.LineString(coords)
+
+        G2.add_edge(node_ids[s], node_ids[t], **merged)
+
+    echo(f'Simplified degree-2 chains: {len(chains)}',
+          f'\n\tNo. of nodes: {G.number_of_nodes()} -> {G2.number_of_nodes()}',
+          f'\n\tNo. of edges: {G.number_of_edges()} -> {G2.number_of_edges()}')
 
     return G2
 # ============================================================================================================
+@instrumented
 def graph_to_geodataframe(
     G: nx.Graph,
     crs: str,
@@ -448,6 +629,7 @@ def graph_to_geodataframe(
 
     return node_gdf, edge_gdf
 # ============================================================================================================
+@instrumented
 def convert_network_geometry_attr_to_wkt(
     G: Union[nx.Graph, nx.DiGraph],
     node_attr: str = "geometry",
@@ -478,18 +660,18 @@ def convert_network_geometry_attr_to_wkt(
 
     # Convert node geometries
     if node_attr is not None:
-        for node, data in tqdm.tqdm(G2.nodes(data=True), desc="Updating node geometries"):
+        for node, data in progress(G2.nodes(data=True), desc="Updating node geometries"):
             if node_attr in data:
                 geom = data.get(node_attr)
-                if isinstance(geom, BaseGeometry):
+                if isinstance(geom, shapely.Geometry):
                     data.update({node_attr: geom.wkt})
 
     # Convert edge geometries
     if edge_attr is not None:
-        for _, _, data in tqdm.tqdm(G2.edges(data=True), desc="Updating edge geometries"):
+        for _, _, data in progress(G2.edges(data=True), desc="Updating edge geometries"):
             if edge_attr in data:
                 geom = data.get(edge_attr)
-                if isinstance(geom, BaseGeometry):
+                if isinstance(geom, shapely.Geometry):
                     data.update({edge_attr: geom.wkt})
 
     return G2
@@ -0,0 +1,281 @@
+import json
+import pathlib
+import numpy as np
+import pandas as pd
+import networkx as nx
+import shapely
+
+from shapely.geometry.base import BaseGeometry
+
+from typing import Any, Iterable, Optional, Union
+
+
+SNAPSHOT_VERSION = 1
+
+
+def export_network_snapshot(
+    G: nx.Graph,
+    folder: Union[str, pathlib.Path],
+    weight: str = "length_m",
+    node_attr_x: str = "proj_x",
+    node_attr_y: str = "proj_y",
+    edge_attr_geom: str = "geometry",
+    edge_cat_attrs: Optional[Iterable[str]] = None,
+    node_cat_attrs: Optional[Iterable[str]] = None,
+) -> pathlib.Path:
+    """
+    Write a graph to a folder of flat NumPy buffers.
+
+    The folder holds one `.npy` file per array plus `meta.json`:
+      - node_ids        : sorted node IDs (int64, or unicode as wide as the
+                          longest ID for non-integer IDs)
+      - node_xy         : (n, 2) float64 node coordinates
+      - indptr, indices : CSR adjacency; neighbours of node i are
+                          indices[indptr[i]:indptr[i + 1]]
+      - slot_edge       : edge row for each CSR slot
+      - edge_uv         : (m, 2) int64 node indices of each edge
+      - weight          : float64 edge weight (NaN if missing)
+      - geom_offsets,
+        geom_wkb        : edge i's WKB is geom_wkb[geom_offsets[i]:geom_offsets[i + 1]]
+                          (empty if the edge has no geometry)
+      - node_cat_<attr>,
+        edge_cat_<attr> : int32 categorical codes (-1 if missing); categories
+                          are stored in meta.json
+
+    Undirected edges appear in the CSR adjacency from both ends, pointing to
+    the same edge row. Use `NetworkSnapshot` to open the folder.
+
+    Parameters
+    ----------
+    G : nx.Graph | nx.DiGraph | nx.MultiGraph | nx.MultiDiGraph
+        Processed network.
+    folder : str or pathlib.Path
+        Output folder; created if missing. Put it under /dev/shm to keep the
+        buffers in shared memory.
+    weight : str, default "length_m"
+        Edge attribute stored as the edge weight.
+    node_attr_x : str, default "proj_x"
+        Node attribute key for x-coordinate.
+    node_attr_y : str, default "proj_y"
+        Node attribute key for y-coordinate.
+    edge_attr_geom : str, default "geometry"
+        Edge attribute key for the Shapely geometry.
+    edge_cat_attrs : iterable of str or None
+        Edge attributes stored as categoricals (e.g. "highway").
+    node_cat_attrs : iterable of str or None
+        Node attributes stored as categoricals.
+
+    Returns
+    -------
+    pathlib.Path
+        The snapshot folder.
+    """
+    folder = pathlib.Path(folder)
+    folder.mkdir(parents=True, exist_ok=True)
+
+    # 1) Nodes, sorted by ID so lookups can use binary search
+    nodes = list(G.nodes())
+    if all(isinstance(n, (int, np.integer)) for n in nodes):
+        node_ids = np.array(nodes, dtype=np.int64)
+    else:
+        # numpy sizes the unicode dtype to the longest ID, so none is truncated
+        node_ids = np.array([str(n) for n in nodes], dtype=str)
+    order = np.argsort(node_ids, kind="stable")
+    node_ids = node_ids[order]
+    assert not np.any(node_ids[1:] == node_ids[:-1]), \
+        f'Node IDs collide once stored as {node_ids.dtype} (e.g. 1 and "1")'
+    nodes = [nodes[i] for i in order]
+    node_index = {n: i for i, n in enumerate(nodes)}
+
+    node_xy = np.array([
+        (G.nodes[n].get(node_attr_x, np.nan), G.nodes[n].get(node_attr_y, np.nan)) for n in nodes],
+        dtype=float).reshape(-1, 2)
+
+    # 2) Edges as flat arrays
+    edge_data = [data for _, _, data in G.edges(data=True)]
+    edge_uv = np.array([(node_index[u], node_index[v]) for u, v in G.edges()], dtype=np.int64).reshape(-1, 2)
+    weights = pd.to_numeric(pd.Series([d.get(weight) for d in edge_data], dtype=object),
+                            errors="coerce").to_numpy(dtype=float)
+
+    # 3) Geometries as one WKB byte buffer plus offsets
+    geoms = np.array([d.get(edge_attr_geom) if isinstance(d.get(edge_attr_geom), BaseGeometry) else None
+                      for d in edge_data], dtype=object)
+    wkb = shapely.to_wkb(geoms) if len(geoms) > 0 else np.array([], dtype=object)
+    wkb = [b if b is not None else b"" for b in wkb]
+    geom_offsets = np.zeros(len(wkb) + 1, dtype=np.int64)
+    geom_offsets[1:] = np.cumsum([len(b) for b in wkb])
+    geom_wkb = np.frombuffer(b"".join(wkb), dtype=np.uint8)
+
+    # 4) CSR adjacency; undirected edges are listed from both ends
+    src, dst = edge_uv[:, 0], edge_uv[:, 1]
+    slot_edge = np.arange(len(edge_uv), dtype=np.int64)
+    if not G.is_directed():
+        src, dst = np.concatenate([src, dst]), np.concatenate([dst, src])
+        slot_edge = np.concatenate([slot_edge, slot_edge])
+    slot_order = np.argsort(src, kind="stable")
+    indices, slot_edge = dst[slot_order], slot_edge[slot_order]
+    indptr = np.zeros(len(nodes) + 1, dtype=np.int64)
+    indptr[1:] = np.cumsum(np.bincount(src, minlength=len(nodes)))
+
+    arrays = {
+        "node_ids": node_ids, "node_xy": node_xy,
+        "indptr": indptr, "indices": indices, "slot_edge": slot_edge,
+        "edge_uv": edge_uv, "weight": weights,
+        "geom_offsets": geom_offsets, "geom_wkb": geom_wkb,
+    }
+
+    # 5) Categorical attributes
+    categories = {"node": {}, "edge": {}}
+    for kind, attrs, records in (("node", node_cat_attrs, [G.nodes[n] for n in nodes]),
+                                 ("edge", edge_cat_attrs, edge_data)):
+        for attr in (attrs or []):
+            # list-valued OSM tags are stored by their string form
+            values = [r.get(attr) if not isinstance(r.get(attr), list) else str(r.get(attr)) for r in records]
+            cat = pd.Categorical(values)
+            arrays[f"{kind}_cat_{attr}"] = cat.codes.astype(np.int32)
+            categories[kind][attr] = [c.item() if isinstance(c, np.generic) else c for c in cat.categories]
+
+    for name, arr in arrays.items():
+        np.save(folder / f"{name}.npy", arr)
+
+    meta = {
+        "version": SNAPSHOT_VERSION,
+        "directed": G.is_directed(),
+        "multigraph": G.is_multigraph(),
+        "crs": G.graph.get("crs", None),
+        "weight": weight,
+        "categories": categories,
+    }
+    with open(folder / "meta.json", "w", encoding="utf-8") as f:
+        json.dump(meta, f, ensure_ascii=False, default=str)
+
+    return folder
+# ============================================================================================
+class NetworkSnapshot:
+    """
+    Read-only graph facade over a folder written by `export_network_snapshot`.
+
+    Every array is opened with `numpy.load(..., mmap_mode='r')`, so processes
+    opening the same snapshot share the OS page cache instead of each holding
+    a private copy of the graph.
+
+    Nodes are addressed by their original IDs; edges by their row number
+    (0 .. number_of_edges - 1).
+
+    Parameters
+    ----------
+    folder : str or pathlib.Path
+        Snapshot folder.
+    mmap : bool, default True
+        If False, load the arrays fully into memory instead.
+    """
+
+    def __init__(self, folder: Union[str, pathlib.Path], mmap: bool = True):
+        self.folder = pathlib.Path(folder)
+
+        with open(self.folder / "meta.json", encoding="utf-8") as f:
+            self.meta = json.load(f)
+        assert self.meta.get("version") == SNAPSHOT_VERSION, \
+            f'Unsupported snapshot version: {self.meta.get("version")}'
+
+        mmap_mode = "r" if mmap else None
+        self._arrays = {p.stem: np.load(p, mmap_mode=mmap_mode) for p in self.folder.glob("*.npy")}
+
+        self.node_ids = self._arrays["node_ids"]
+        self.node_xy = self._arrays["node_xy"]
+        self.indptr = self._arrays["indptr"]
+        self.indices = self._arrays["indices"]
+        self.slot_edge = self._arrays["slot_edge"]
+        self.edge_uv = self._arrays["edge_uv"]
+        self.weight = self._arrays["weight"]
+    # --------------------------------------------------------------------------------------
+    @property
+    def crs(self) -> Any:
+        return self.meta["crs"]
+
+    def is_directed(self) -> bool:
+        return self.meta["directed"]
+
+    def number_of_nodes(self) -> int:
+        return len(self.node_ids)
+
+    def number_of_edges(self) -> int:
+        return len(self.edge_uv)
+    # --------------------------------------------------------------------------------------
+    def node_index(self, node: Union[Any, Iterable[Any]]) -> Union[int, np.ndarray]:
+        """
+        Position(s) of node ID(s) in the snapshot arrays (binary search).
+
+        Queries are compared exactly: with string IDs every query is matched
+        by its `str()`, and with integer IDs only integer queries can match.
+        """
+        if self.node_ids.dtype.kind == "U":
+            ids = np.vectorize(str, otypes=[str])(np.asarray(node, dtype=object)) if np.ndim(node) else \
+                np.asarray(str(node))
+        else:
+            ids = np.asarray(node)
+            if ids.dtype.kind not in "iu":
+                raise KeyError(f'Node(s) not in snapshot: {node}')
+        idx = np.searchsorted(self.node_ids, ids)
+        found = (idx < len(self.node_ids)) & (self.node_ids[np.minimum(idx, len(self.node_ids) - 1)] == ids)
+        if not np.all(found):
+            raise KeyError(f'Node(s) not in snapshot: {ids[~found] if ids.ndim else node}')
+        return int(idx) if idx.ndim == 0 else idx
+    # --------------------------------------------------------------------------------------
+    def neighbors(self, node: Any) -> np.ndarray:
+        """
+        Neighbour node IDs (successors for directed graphs).
+        """
+        i = self.node_index(node)
+        return self.node_ids[self.indices[self.indptr[i]:self.indptr[i + 1]]]
+
+    def incident_edges(self, node: Any) -> np.ndarray:
+        """
+        Rows of the edges leaving `node` (all incident edges if undirected).
+        """
+        i = self.node_index(node)
+        return self.slot_edge[self.indptr[i]:self.indptr[i + 1]]
+
+    def degree(self, node: Any) -> int:
+        i = self.node_index(node)
+        return int(self.indptr[i + 1] - self.indptr[i])
+    # --------------------------------------------------------------------------------------
+    def node_coords(self, node: Any) -> np.ndarray:
+        return self.node_xy[self.node_index(node)]
+
+    def edge_nodes(self, edge: int) -> np.ndarray:
+        """
+        (u, v) node IDs of an edge row.
+        """
+        return self.node_ids[self.edge_uv[edge]]
+
+    def edge_geometry(self, edges: Union[int, Iterable[int]]) -> Union[BaseGeometry, np.ndarray, None]:
+        """
+        Decode edge geometries from WKB; None for edges without geometry.
+        """
+        rows = np.atleast_1d(edges)
+        offsets, buf = self._arrays["geom_offsets"], self._arrays["geom_wkb"]
+        wkb = [bytes(buf[offsets[r]:offsets[r + 1]]) or None for r in rows]
+        geoms = shapely.from_wkb(np.array(wkb, dtype=object))
+        return geoms[0] if np.ndim(edges) == 0 else geoms
+    # --------------------------------------------------------------------------------------
+    def _categorical(self, kind: str, attr: str, rows: Union[int, np.ndarray]) -> Any:
+        key = f"{kind}_cat_{attr}"
+        if key not in self._arrays:
+            raise KeyError(f'Categorical {kind} attribute not in snapshot: {attr}')
+        cats = np.array(self.meta["categories"][kind][attr] + [None], dtype=object)
+        # code -1 (missing) maps to the trailing None
+        return cats[self._arrays[key][rows]]
+
+    def edge_attr(self, attr: str, edges: Union[int, Iterable[int]]) -> Any:
+        """
+        Categorical edge attribute value(s) for edge row(s).
+        """
+        return self._categorical("edge", attr, np.asarray(edges))
+
+    def node_attr(self, attr: str, node: Union[Any, Iterable[Any]]) -> Any:
+        """
+        Categorical node attribute value(s) for node ID(s).
+        """
+        return self._categorical("node", attr, self.node_index(node))
+# ============================================================================================
@@ -0,0 +1,292 @@
+import os
+import pathlib
+import numpy as np
+import pandas as pd
+import networkx as nx
+
+from scipy import sparse
+from scipy.sparse.csgraph import dijkstra
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from ..instrument import progress
+
+from typing import Any, Dict, Iterable, Optional, Tuple, Union
+
+
+def graph_to_csr(
+    G: nx.Graph,
+    weight: str = "length_m",
+) -> Tuple[sparse.csr_matrix, np.ndarray]:
+    """
+    Convert a graph into a sparse CSR weight matrix.
+
+    Parallel edges are reduced to their minimal `weight`; self-loops and
+    edges whose weight is missing or not a finite, non-negative number are
+    dropped. Undirected graphs produce a symmetric matrix.
+
+    Parameters
+    ----------
+    G : nx.Graph | nx.DiGraph | nx.MultiGraph | nx.MultiDiGraph
+        Input graph.
+    weight : str, default "length_m"
+        Edge attribute used as the travel cost.
+
+    Returns
+    -------
+    csr : scipy.sparse.csr_matrix
+        (n, n) matrix where entry (i, j) is the cost of edge i → j.
+    node_ids : numpy.ndarray
+        Node IDs; row/column i of `csr` corresponds to node_ids[i].
+    """
+    node_ids = np.empty(G.number_of_nodes(), dtype=object)
+    node_ids[:] = list(G.nodes())
+    node_index = {n: i for i, n in enumerate(node_ids)}
+
+    # 1) Collect (u, v, w) triples as flat arrays
+    rows, cols, vals = [], [], []
+    for u, v, data in G.edges(data=True):
+        if u == v:
+            continue
+        try:
+            w = float(data.get(weight))
+        except (TypeError, ValueError):
+            continue
+        if not (np.isfinite(w) and w >= 0):
+            continue
+        rows.append(node_index[u])
+        cols.append(node_index[v])
+        vals.append(w)
+
+    rows = np.asarray(rows, dtype=np.int64)
+    cols = np.asarray(cols, dtype=np.int64)
+    vals = np.asarray(vals, dtype=float)
+
+    # 2) Undirected edges are traversable both ways
+    if not G.is_directed():
+        rows, cols = np.concatenate([rows, cols]), np.concatenate([cols, rows])
+        vals = np.concatenate([vals, vals])
+
+    # 3) Keep the minimal weight per (row, col); CSR construction would sum duplicates
+    n = len(node_ids)
+    keys = rows * n + cols
+    order = np.lexsort((vals, keys))
+    keys, vals = keys[order], vals[order]
+    first = np.ones(len(keys), dtype=bool)
+    first[1:] = keys[1:] != keys[:-1]
+    keys, vals = keys[first], vals[first]
+
+    csr = sparse.csr_matrix((vals, (keys // n, keys % n)), shape=(n, n))
+
+    return csr, node_ids
+# ============================================================================================
+# Upper bound on one chunk's cost block; dijkstra fills a full (chunk, n_nodes) row block
+MAX_BLOCK_BYTES = 256 * 2 ** 20
+
+# Worker state for process-pool execution: the matrix is sent once per worker
+_WORKER_CSR = None
+
+
+def _init_worker(csr: sparse.csr_matrix) -> None:
+    global _WORKER_CSR
+    _WORKER_CSR = csr
+
+
+def _dijkstra_chunk(
+    origin_idx: np.ndarray,
+    dest_idx: Optional[np.ndarray],
+    cutoff: float,
+    directed: bool,
+) -> np.ndarray:
+    dist = dijkstra(_WORKER_CSR, directed=directed, indices=origin_idx, limit=cutoff)
+    return dist if dest_idx is None else dist[:, dest_idx]
+# ============================================================================================
+class TravelCostEngine:
+    """
+    One-to-many and many-to-many travel-cost matrices over a network.
+
+    The graph is converted once into a CSR weight matrix (see `graph_to_csr`),
+    and the node-ID → matrix-index mapping is cached; every query then runs
+    `scipy.sparse.csgraph.dijkstra` on the matrix instead of per-origin
+    networkx searches.
+
+    Parameters
+    ----------
+    G : nx.Graph | nx.DiGraph | nx.MultiGraph | nx.MultiDiGraph
+        Processed network.
+    weight : str, default "length_m"
+        Edge attribute used as the travel cost.
+    """
+
+    def __init__(self, G: nx.Graph, weight: str = "length_m"):
+        self.weight = weight
+        self.directed = G.is_directed()
+        self.csr, self.node_ids = graph_to_csr(G, weight=weight)
+        self.node_index: Dict[Any, int] = {n: i for i, n in enumerate(self.node_ids)}
+    # --------------------------------------------------------------------------------------
+    def _to_index(self, nodes: Optional[Iterable[Any]]) -> Optional[np.ndarray]:
+        if nodes is None:
+            return None
+        nodes = list(nodes)
+        missing = [n for n in nodes if n not in self.node_index]
+        assert not missing, f'Nodes not in network: {missing[:10]}'
+        return np.fromiter((self.node_index[n] for n in nodes), dtype=np.int64)
+    # --------------------------------------------------------------------------------------
+    def _iter_chunks(
+        self,
+        origin_idx: np.ndarray,
+        dest_idx: Optional[np.ndarray],
+        cutoff: float,
+        chunk_size: int,
+        n_jobs: int,
+    ):
+        # Yield (chunk_start, cost_block) in origin order. The chunk is capped
+        # so one block stays within MAX_BLOCK_BYTES, and at most 2 * n_jobs
+        # blocks are in flight, so memory does not grow with the origin count.
+        n_cols = self.csr.shape[0]
+        chunk_size = max(1, min(chunk_size, MAX_BLOCK_BYTES // (8 * max(n_cols, 1))))
+        starts = range(0, len(origin_idx), chunk_size)
+
+        if n_jobs == 1:
+            for s in progress(starts, desc="Computing travel costs"):
+                dist = dijkstra(self.csr, directed=self.directed, indices=origin_idx[s:s + chunk_size], limit=cutoff)
+                yield s, dist if dest_idx is None else dist[:, dest_idx]
+            return
+
+        with ProcessPoolExecutor(max_workers=n_jobs, initializer=_init_worker, initargs=(self.csr,)) as pool:
+            def _bounded():
+                pending = deque()
+                for s in starts:
+                    pending.append((s, pool.submit(
+                        _dijkstra_chunk, origin_idx[s:s + chunk_size], dest_idx, cutoff, self.directed)))
+                    if len(pending) >= 2 * n_jobs:
+                        s0, fut = pending.popleft()
+                        yield s0, fut.result()
+                while pending:
+                    s0, fut = pending.popleft()
+                    yield s0, fut.result()
+
+            yield from progress(_bounded(), total=len(starts), desc="Computing travel costs")
+    # --------------------------------------------------------------------------------------
+    def one_to_many(
+        self,
+        origin: Any,
+        destinations: Optional[Iterable[Any]] = None,
+        cutoff: float = np.inf,
+    ) -> pd.Series:
+        """
+        Travel costs from one origin node.
+
+        Parameters
+        ----------
+        origin : node ID
+            Origin node.
+        destinations : iterable of node IDs or None
+            Destination nodes; None means every node in the network.
+        cutoff : float, default inf
+            Maximal cost to search; farther destinations get inf.
+
+        Returns
+        -------
+        pandas.Series
+            Cost indexed by destination node ID.
+        """
+        dest_idx = self._to_index(destinations)
+        origin_idx = self._to_index([origin])
+
+        dist = dijkstra(self.csr, directed=self.directed, indices=origin_idx, limit=cutoff)[0]
+        if dest_idx is None:
+            return pd.Series(dist, index=self.node_ids, name=self.weight)
+        return pd.Series(dist[dest_idx], index=self.node_ids[dest_idx], name=self.weight)
+    # --------------------------------------------------------------------------------------
+    def many_to_many(
+        self,
+        origins: Iterable[Any],
+        destinations: Optional[Iterable[Any]] = None,
+        cutoff: float = np.inf,
+        chunk_size: int = 256,
+        n_jobs: int = 1,
+    ) -> pd.DataFrame:
+        """
+        Dense travel-cost matrix between origins and destinations.
+
+        Parameters
+        ----------
+        origins : iterable of node IDs
+            Origin nodes (rows).
+        destinations : iterable of node IDs or None
+            Destination nodes (columns); None means every node in the network.
+        cutoff : float, default inf
+            Maximal cost to search; farther pairs get inf.
+        chunk_size : int, default 256
+            Number of origins solved per task; lowered on large networks so a
+            task's cost block stays within MAX_BLOCK_BYTES.
+        n_jobs : int, default 1
+            Number of worker processes; -1 uses all CPUs.
+
+        Returns
+        -------
+        pandas.DataFrame
+            Cost matrix indexed by origin, with destination columns.
+        """
+        origins = list(origins)
+        origin_idx = self._to_index(origins)
+        dest_idx = self._to_index(None if destinations is None else list(destinations))
+        n_jobs = os.cpu_count() if n_jobs == -1 else n_jobs
+
+        n_dest = len(self.node_ids) if dest_idx is None else len(dest_idx)
+        out = np.empty((len(origin_idx), n_dest), dtype=float)
+        for s, block in self._iter_chunks(origin_idx, dest_idx, cutoff, chunk_size, n_jobs):
+            out[s:s + len(block)] = block
+
+        columns = self.node_ids if dest_idx is None else self.node_ids[dest_idx]
+        return pd.DataFrame(out, index=origins, columns=columns)
+    # --------------------------------------------------------------------------------------
+    def many_to_many_to_file(
+        self,
+        path: Union[str, pathlib.Path],
+        origins: Iterable[Any],
+        destinations: Optional[Iterable[Any]] = None,
+        cutoff: float = np.inf,
+        chunk_size: int = 256,
+        n_jobs: int = 1,
+    ) -> int:
+        """
+        Stream origin-destination costs to a CSV file, chunk by chunk.
+
+        Only reachable pairs (cost within `cutoff`) are written, as long-format
+        rows `origin, destination, <weight>`, so memory stays bounded by one
+        chunk regardless of the size of the OD set.
+
+        Parameters
+        ----------
+        path : str or pathlib.Path
+            Output CSV path; overwritten if it exists.
+        origins, destinations, cutoff, chunk_size, n_jobs
+            As in `many_to_many`.
+
+        Returns
+        -------
+        int
+            Number of OD pairs written.
+        """
+        origin_idx = self._to_index(list(origins))
+        dest_idx = self._to_index(None if destinations is None else list(destinations))
+        dest_ids = self.node_ids if dest_idx is None else self.node_ids[dest_idx]
+        n_jobs = os.cpu_count() if n_jobs == -1 else n_jobs
+
+        n_written = 0
+        with open(path, 'w', newline='') as f:
+            pd.DataFrame(columns=['origin', 'destination', self.weight]).to_csv(f, index=False)
+
+            for s, block in self._iter_chunks(origin_idx, dest_idx, cutoff, chunk_size, n_jobs):
+                o, d = np.nonzero(np.isfinite(block))
+                pd.DataFrame({
+                    'origin': self.node_ids[origin_idx[s + o]],
+                    'destination': dest_ids[d],
+                    self.weight: block[o, d],
+                }).to_csv(f, index=False, header=False)
+                n_written += len(o)
+
+        return n_written
+# ============================================================================================
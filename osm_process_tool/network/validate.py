@@ -0,0 +1,190 @@
+from __future__ import annotations
+
+import networkx as nx
+
+from typing import Any, Dict, List, Optional
+
+from .._lazy import lazy_import
+from ..instrument import echo, instrumented
+
+np = lazy_import('numpy')
+pd = lazy_import('pandas')
+shapely = lazy_import('shapely')
+
+
+CHECKS = [
+    'missing_crs',
+    'missing_node_coords',
+    'missing_geometry',
+    'endpoint_mismatch',
+    'missing_length',
+    'length_mismatch',
+    'duplicate_undirected_pair',
+    'dangling_node',
+]
+
+
+@instrumented
+def validate_network(
+    G: nx.Graph,
+    node_attr_x: str = "proj_x",
+    node_attr_y: str = "proj_y",
+    edge_attr_geom: str = "geometry",
+    edge_attr_len: str = "length_m",
+    endpoint_tol: float = 1e-6,
+    length_rtol: float = 1e-6,
+    length_atol: float = 1e-3,
+    checks: Optional[List[str]] = None,
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Check a processed network for integrity problems.
+
+    Node coordinates, edge endpoints, geometries and lengths are extracted
+    once into arrays, and every check runs on those arrays.
+
+    Checks
+    ------
+    missing_crs               : the graph has no 'crs' attribute
+    missing_node_coords       : node lacks `node_attr_x` / `node_attr_y`
+    missing_geometry          : edge lacks a LineString / MultiLineString
+    endpoint_mismatch         : the geometry's first and last vertices are not
+                                the coordinates of the edge's two nodes (in
+                                either orientation), within `endpoint_tol`
+    missing_length            : `edge_attr_len` is missing or NaN
+    length_mismatch           : `edge_attr_len` differs from the geometry length
+                                by more than length_atol + length_rtol * length
+    duplicate_undirected_pair : more than one edge joins the same two nodes,
+                                ignoring direction
+    dangling_node             : node without any incident edge
+
+    Parameters
+    ----------
+    G : nx.Graph | nx.DiGraph | nx.MultiGraph | nx.MultiDiGraph
+        Processed network, e.g. after `process_isolated_nodes`.
+    node_attr_x : str, default "proj_x"
+        Node attribute key for projected x-coordinate.
+    node_attr_y : str, default "proj_y"
+        Node attribute key for projected y-coordinate.
+    edge_attr_geom : str, default "geometry"
+        Edge attribute key for the projected Shapely geometry.
+    edge_attr_len : str, default "length_m"
+        Edge attribute key for length in metres.
+    endpoint_tol : float, default 1e-6
+        Tolerance (CRS units) for matching geometry endpoints to nodes.
+    length_rtol, length_atol : float
+        Relative and absolute tolerance for the length check.
+    checks : list of str or None
+        Subset of CHECKS to run; None runs all of them.
+
+    Returns
+    -------
+    dict
+        check name → {'count': int, 'ids': list}, where ids are node IDs for
+        node checks and edge IDs (u, v) or (u, v, key) for edge checks.
+    """
+    checks = CHECKS if checks is None else checks
+    unknown = set(checks) - set(CHECKS)
+    assert not unknown, f'Unknown checks: {sorted(unknown)}'
+
+    # 1) Extract arrays once
+    node_ids = np.empty(G.number_of_nodes(), dtype=object)
+    node_ids[:] = list(G.nodes())
+    node_index = {n: i for i, n in enumerate(node_ids)}
+    node_xy = pd.DataFrame.from_records(
+        [(d.get(node_attr_x), d.get(node_attr_y)) for _, d in G.nodes(data=True)],
+        columns=['x', 'y'], index=range(len(node_ids))).apply(pd.to_numeric, errors='coerce').to_numpy(float)
+    node_xy = node_xy.reshape(-1, 2)
+
+    edge_iter = G.edges(keys=True, data=True) if G.is_multigraph() else G.edges(data=True)
+    edge_ids, eu, ev, geoms, lengths = [], [], [], [], []
+    for *eid, data in edge_iter:
+        edge_ids.append(tuple(eid))
+        eu.append(node_index[eid[0]])
+        ev.append(node_index[eid[1]])
+        geom = data.get(edge_attr_geom)
+        geoms.append(geom if isinstance(geom, (shapely.LineString, shapely.MultiLineString)) else None)
+        lengths.append(data.get(edge_attr_len))
+
+    n_edges = len(edge_ids)
+    edge_id_arr = np.empty(n_edges, dtype=object)
+    edge_id_arr[:] = edge_ids
+    eu = np.asarray(eu, dtype=np.int64)
+    ev = np.asarray(ev, dtype=np.int64)
+    geoms = np.array(geoms, dtype=object)
+    lengths = pd.to_numeric(pd.Series(lengths, dtype=object), errors='coerce').to_numpy(float)
+
+    has_geom = ~shapely.is_missing(geoms) if n_edges > 0 else np.zeros(0, dtype=bool)
+    node_ok = ~np.isnan(node_xy).any(axis=1)
+
+    def _result(mask, ids):
+        return {'count': int(mask.sum()), 'ids': ids[mask].tolist()}
+
+    results = {}
+
+    # 2) Graph-level
+    if 'missing_crs' in checks:
+        missing = G.graph.get('crs') is None
+        results['missing_crs'] = {'count': int(missing), 'ids': []}
+
+    # 3) Nodes
+    if 'missing_node_coords' in checks:
+        results['missing_node_coords'] = _result(~node_ok, node_ids)
+
+    if 'dangling_node' in checks:
+        degree = np.bincount(np.concatenate([eu, ev]), minlength=len(node_ids))
+        results['dangling_node'] = _result(degree == 0, node_ids)
+
+    # 4) Edge geometries
+    if 'missing_geometry' in checks:
+        results['missing_geometry'] = _result(~has_geom, edge_id_arr)
+
+    if 'endpoint_mismatch' in checks:
+        # first / last vertex of every geometry, from one flat coordinate array
+        start = np.full((n_edges, 2), np.nan)
+        end = np.full((n_edges, 2), np.nan)
+        if has_geom.any():
+            coords, idx = shapely.get_coordinates(geoms, return_index=True)
+            first = np.concatenate([[0], np.flatnonzero(np.diff(idx)) + 1])
+            last = np.concatenate([first[1:] - 1, [len(idx) - 1]])
+            start[idx[first]] = coords[first]
+            end[idx[last]] = coords[last]
+
+        pu, pv = node_xy[eu], node_xy[ev]
+
+        def _close(a, b):
+            return np.hypot(a[:, 0] - b[:, 0], a[:, 1] - b[:, 1]) <= endpoint_tol
+
+        matched = (_close(start, pu) & _close(end, pv)) | (_close(start, pv) & _close(end, pu))
+        checkable = has_geom & node_ok[eu] & node_ok[ev]
+        results['endpoint_mismatch'] = _result(checkable & ~matched, edge_id_arr)
+
+    # 5) Edge lengths
+    if 'missing_length' in checks:
+        results['missing_length'] = _result(np.isnan(lengths), edge_id_arr)
+
+    if 'length_mismatch' in checks:
+        geom_len = np.full(n_edges, np.nan)
+        geom_len[has_geom] = shapely.length(geoms[has_geom])
+        checkable = has_geom & ~np.isnan(lengths)
+        diff = np.abs(np.where(checkable, lengths - geom_len, 0.))
+        bad = checkable & (diff > length_atol + length_rtol * np.nan_to_num(geom_len))
+        results['length_mismatch'] = _result(bad, edge_id_arr)
+
+    # 6) Topology
+    if 'duplicate_undirected_pair' in checks:
+        lo, hi = np.minimum(eu, ev), np.maximum(eu, ev)
+        keys = lo * len(node_ids) + hi
+        _, inverse, counts = np.unique(keys, return_inverse=True, return_counts=True)
+        results['duplicate_undirected_pair'] = _result(counts[inverse] > 1, edge_id_arr)
+
+    return results
+# ============================================================================================
+def print_validation_report(results: Dict[str, Dict[str, Any]], max_ids: int = 5) -> None:
+    """
+    Print the count of each check from `validate_network`, with a few example IDs.
+    """
+    for name, res in results.items():
+        examples = ', '.join(map(str, res['ids'][:max_ids]))
+        more = ' ...' if len(res['ids']) > max_ids else ''
+        echo(f'{name:<28}{res["count"]:>10}' + (f'    e.g. {examples}{more}' if examples else ''))
+# ============================================================================================
@@ -0,0 +1,69 @@
+import pathlib
+
+from .instrument import instrumented, progress
+
+
+DEFAULT_POI_TAGS = {'amenity': True, 'shop': True, 'tourism': True, 'leisure': True}
+DEFAULT_POI_COLUMNS = ['id', 'osm_type', 'addr:postcode', 'addr:street']
+
+
+@instrumented
+def extract_osm_poi(osm_path, tags_filter=None, columns=None):
+    '''
+    Extract POIs from an OSM .pbf file with `pyrosm`
+
+    :param osm_path: path of the .osm.pbf file
+    :param tags_filter: pyrosm tag filter, defaults to amenity / shop / tourism / leisure
+    :param columns: attribute columns kept besides the tag columns and geometry
+    :return: GeoDataFrame of POIs
+    '''
+    import pyrosm
+
+    if tags_filter is None:
+        tags_filter = DEFAULT_POI_TAGS
+    if columns is None:
+        columns = DEFAULT_POI_COLUMNS
+
+    # initialize the OSM object
+    osm_map = pyrosm.OSM(str(osm_path))
+    # get all POIs
+    pois = osm_map.get_pois(tags_filter)
+    # selected necessary columns, skipping tags absent from this extract
+    keep = [c for c in columns + list(tags_filter.keys()) if c in pois.columns]
+    pois = pois[keep + ['geometry']]
+
+    return pois
+# ======================================================================================================================
+def extract_osm_poi_snapshots(osm_folder, save_folder, pattern='*.osm.pbf', prefix=None, tags_filter=None, columns=None):
+    '''
+    Extract POIs from every dated .pbf snapshot in a folder, saving `osm_poi_{date}.geojson` per snapshot
+
+    The date is the file stem with `prefix` (e.g. 'singapore_') and '.osm' removed.
+
+    :param osm_folder: folder holding the .osm.pbf snapshots
+    :param save_folder: output folder
+    :param pattern: glob pattern of the snapshot files
+    :param prefix: file-name prefix stripped to get the date
+    :param tags_filter: see `extract_osm_poi`
+    :param columns: see `extract_osm_poi`
+    :return: list of saved paths
+    '''
+    save_folder = pathlib.Path(save_folder)
+    save_folder.mkdir(parents=True, exist_ok=True)
+
+    osm_path_li = sorted(pathlib.Path(osm_folder).glob(pattern))
+
+    saved = []
+    for osm_path in progress(osm_path_li, total=len(osm_path_li), desc='Extracting POIs'):
+        pois = extract_osm_poi(osm_path, tags_filter=tags_filter, columns=columns)
+
+        # save the data
+        _dt = osm_path.name.replace('.osm.pbf', '').replace('.pbf', '')
+        if prefix:
+            _dt = _dt.replace(prefix, '')
+        save_path = save_folder / f'osm_poi_{_dt}.geojson'
+        pois.to_file(save_path, driver='GeoJSON')
+        saved.append(save_path)
+
+    return saved
+# ======================================================================================================================
@@ -0,0 +1,334 @@
+from __future__ import annotations
+
+import pathlib
+import warnings
+
+from typing import TYPE_CHECKING, Dict, Iterable, Iterator, List, Optional, Sequence, Union
+
+from ._lazy import lazy_import
+from .instrument import echo, instrumented, progress
+
+if TYPE_CHECKING:
+    import geopandas as gpd
+    import pandas as pd
+
+np = lazy_import('numpy')
+pd = lazy_import('pandas')
+gpd = lazy_import('geopandas')
+shapely = lazy_import('shapely')
+
+
+KEY_COLS = ['osm_type', 'id']
+
+
+def iter_poi_chunks(
+    path: Union[str, pathlib.Path],
+    chunk_size: int = 500_000,
+) -> Iterator[gpd.GeoDataFrame]:
+    """
+    Read a POI file (e.g. `osm_poi_{date}.geojson`) in row chunks.
+
+    The file is read once, front to back: as Arrow batches through pyogrio if
+    pyarrow is installed, else feature by feature through fiona. Without
+    either (the default geopandas install), a warning is issued and the whole
+    file is read at once and sliced in memory; install pyarrow to keep memory
+    bounded by one chunk.
+
+    Parameters
+    ----------
+    path : str or pathlib.Path
+        Any vector file readable by geopandas.
+    chunk_size : int, default 500_000
+        Rows per chunk.
+
+    Yields
+    ------
+    geopandas.GeoDataFrame
+    """
+    # 1) One Arrow stream, decoded batch by batch
+    try:
+        import pyarrow  # noqa: F401  (open_arrow needs it)
+        from pyogrio.raw import open_arrow
+    except ImportError:
+        pass
+    else:
+        with open_arrow(path, batch_size=chunk_size, use_pyarrow=True) as (meta, reader):
+            geom_col = meta['geometry_name'] or 'wkb_geometry'
+            for batch in reader:
+                if batch.num_rows == 0:
+                    continue
+                data = batch.to_pandas()
+                geoms = shapely.from_wkb(data.pop(geom_col).to_numpy())
+                yield gpd.GeoDataFrame(data, geometry=geoms, crs=meta['crs'])
+        return
+
+    # 2) One fiona iteration, grouped into chunks
+    try:
+        import fiona
+    except ImportError:
+        pass
+    else:
+        with fiona.open(path) as src:
+            crs, columns = src.crs, list(src.schema['properties'])
+            features = []
+            for feature in src:
+                features.append(feature)
+                if len(features) == chunk_size:
+                    yield gpd.GeoDataFrame.from_features(features, crs=crs, columns=columns + ['geometry'])
+                    features = []
+            if features:
+                yield gpd.GeoDataFrame.from_features(features, crs=crs, columns=columns + ['geometry'])
+        return
+
+    # 3) Single read, sliced in memory
+    warnings.warn(
+        f'Neither pyarrow nor fiona is installed: reading all of {pathlib.Path(path).name} '
+        'into memory before chunking. Install pyarrow (pip install pyarrow) to stream it.',
+        stacklevel=2)
+    data = gpd.read_file(path)
+    for start in range(0, len(data), chunk_size):
+        yield data.iloc[start:start + chunk_size]
+# ============================================================================================
+def _key_text(values: pd.Series) -> pd.Series:
+    # Key column as text, with integer-valued numbers written without a decimal part
+    if pd.api.types.is_float_dtype(values.dtype):
+        numbers = values.to_numpy(dtype=float)
+        integral = np.isfinite(numbers) & (np.floor(numbers) == numbers)
+        if integral[values.notna().to_numpy()].all():
+            return values.astype('Int64').astype('string')
+    text = values.astype('string')
+    return text.str.replace(r'^(-?\d+)\.0+$', r'\1', regex=True)
+
+
+def hash_poi_rows(
+    data: gpd.GeoDataFrame,
+    tag_cols: Sequence[str],
+    key_cols: Sequence[str] = KEY_COLS,
+    geom_grid_size: Optional[float] = None,
+) -> pd.DataFrame:
+    """
+    Hash each POI's identity, tags and geometry into 64-bit integers.
+
+    Parameters
+    ----------
+    data : geopandas.GeoDataFrame
+        POIs with `key_cols` and a geometry column.
+    tag_cols : sequence of str
+        Tag columns hashed together; columns absent from `data` count as
+        missing values, so snapshots with different schemas compare equal on
+        the tags they share.
+    key_cols : sequence of str, default ('osm_type', 'id')
+        Columns identifying a POI across snapshots.
+    geom_grid_size : float or None
+        If given, snap geometries to this grid before hashing, so coordinate
+        noise below it is not reported as a move.
+
+    Keys are hashed in a canonical text form, so an ID read as 123 in one
+    snapshot and as 123.0 in another (e.g. a float column with nulls) still
+    match; the returned key columns keep their original values.
+
+    Returns
+    -------
+    pandas.DataFrame
+        Columns `key_cols` + ['key_hash', 'tag_hash', 'geom_hash'].
+    """
+    keys = data[list(key_cols)].reset_index(drop=True)
+    key_text = pd.DataFrame({c: _key_text(keys[c]) for c in key_cols})
+    # pandas' string dtype maps None/NaN to one missing value, so both hash alike
+    tags = data.reindex(columns=list(tag_cols)).astype('string').reset_index(drop=True)
+
+    geoms = data.geometry.values
+    if geom_grid_size is not None:
+        geoms = shapely.set_precision(geoms, geom_grid_size)
+    wkb = shapely.to_wkb(np.asarray(geoms), hex=False)
+
+    out = keys.copy()
+    out['key_hash'] = pd.util.hash_pandas_object(key_text, index=False).to_numpy()
+    out['tag_hash'] = pd.util.hash_pandas_object(tags, index=False).to_numpy() if len(tag_cols) else np.uint64(0)
+    out['geom_hash'] = pd.util.hash_array(wkb.astype(object))
+    return out
+# ============================================================================================
+def _field_names(path: Union[str, pathlib.Path]) -> List[str]:
+    try:
+        import pyogrio
+        return list(pyogrio.read_info(path)['fields'])
+    except ImportError:
+        return [c for c in gpd.read_file(path, rows=slice(0, 1)).columns if c != 'geometry']
+
+
+@instrumented
+def hash_poi_snapshot(
+    source: Union[str, pathlib.Path, gpd.GeoDataFrame],
+    tag_cols: Optional[Sequence[str]] = None,
+    key_cols: Sequence[str] = KEY_COLS,
+    chunk_size: int = 500_000,
+    geom_grid_size: Optional[float] = None,
+) -> pd.DataFrame:
+    """
+    Hash table of one POI snapshot, read chunk by chunk.
+
+    Only the key columns and three uint64 hashes per POI are kept, so the
+    table is far smaller than the snapshot itself. Duplicate keys keep their
+    first row.
+
+    Parameters
+    ----------
+    source : path or geopandas.GeoDataFrame
+        POI snapshot, e.g. `osm_poi_{date}.geojson`.
+    tag_cols : sequence of str or None
+        Tag columns to compare; None uses every non-key attribute column.
+    key_cols : sequence of str, default ('osm_type', 'id')
+        Columns identifying a POI across snapshots.
+    chunk_size : int, default 500_000
+        Rows read per chunk when `source` is a path.
+    geom_grid_size : float or None
+        See `hash_poi_rows`.
+
+    Returns
+    -------
+    pandas.DataFrame
+        See `hash_poi_rows`.
+    """
+    if isinstance(source, (str, pathlib.Path)):
+        if tag_cols is None:
+            tag_cols = [c for c in _field_names(source) if c not in key_cols]
+        chunks = (hash_poi_rows(c, tag_cols, key_cols, geom_grid_size)
+                  for c in iter_poi_chunks(source, chunk_size=chunk_size))
+        hashed = pd.concat(list(chunks), ignore_index=True)
+    else:
+        if tag_cols is None:
+            tag_cols = [c for c in source.columns if c not in key_cols and c != source.geometry.name]
+        hashed = hash_poi_rows(source, tag_cols, key_cols, geom_grid_size)
+
+    return hashed.drop_duplicates(subset='key_hash', keep='first').reset_index(drop=True)
+# ============================================================================================
+@instrumented
+def diff_poi_hashes(
+    old: pd.DataFrame,
+    new: pd.DataFrame,
+    key_cols: Sequence[str] = KEY_COLS,
+) -> Dict[str, pd.DataFrame]:
+    """
+    Compare two hash tables from `hash_poi_snapshot`.
+
+    Keys are matched by sorting and binary search on `key_hash`; matched POIs
+    are compared on `geom_hash` and `tag_hash`.
+
+    Returns
+    -------
+    dict of pandas.DataFrame
+        'added'    : keys only in `new`
+        'removed'  : keys only in `old`
+        'moved'    : keys in both whose geometry changed
+        'retagged' : keys in both whose tags changed
+        Each frame holds `key_cols`; a POI can be both moved and retagged.
+    """
+    old_key = old['key_hash'].to_numpy()
+    new_key = new['key_hash'].to_numpy()
+
+    # Position of every new key in the sorted old keys
+    order = np.argsort(old_key, kind='stable')
+    old_sorted = old_key[order]
+    if len(old_sorted) > 0:
+        pos = np.minimum(np.searchsorted(old_sorted, new_key), len(old_sorted) - 1)
+        in_old = old_sorted[pos] == new_key
+    else:
+        pos = np.zeros(len(new_key), dtype=np.int64)
+        in_old = np.zeros(len(new_key), dtype=bool)
+
+    match_new = np.flatnonzero(in_old)
+    match_old = order[pos[in_old]]
+
+    still_there = np.zeros(len(old_key), dtype=bool)
+    still_there[match_old] = True
+
+    moved = old['geom_hash'].to_numpy()[match_old] != new['geom_hash'].to_numpy()[match_new]
+    retagged = old['tag_hash'].to_numpy()[match_old] != new['tag_hash'].to_numpy()[match_new]
+
+    key_cols = list(key_cols)
+    return {
+        'added': new.loc[~in_old, key_cols].reset_index(drop=True),
+        'removed': old.loc[~still_there, key_cols].reset_index(drop=True),
+        'moved': new.iloc[match_new[moved]][key_cols].reset_index(drop=True),
+        'retagged': new.iloc[match_new[retagged]][key_cols].reset_index(drop=True),
+    }
+# ============================================================================================
+def diff_poi_snapshots(
+    old: Union[str, pathlib.Path, gpd.GeoDataFrame],
+    new: Union[str, pathlib.Path, gpd.GeoDataFrame],
+    tag_cols: Optional[Sequence[str]] = None,
+    key_cols: Sequence[str] = KEY_COLS,
+    chunk_size: int = 500_000,
+    geom_grid_size: Optional[float] = None,
+) -> Dict[str, pd.DataFrame]:
+    """
+    Added, removed, moved and retagged POIs between two snapshots.
+
+    With `tag_cols` None, the tags compared are the union of both snapshots'
+    attribute columns. See `hash_poi_snapshot` and `diff_poi_hashes`.
+    """
+    if tag_cols is None:
+        cols = []
+        for src in (old, new):
+            names = _field_names(src) if isinstance(src, (str, pathlib.Path)) else \
+                [c for c in src.columns if c != src.geometry.name]
+            cols += [c for c in names if c not in key_cols and c not in cols]
+        tag_cols = cols
+
+    old_h = hash_poi_snapshot(old, tag_cols, key_cols, chunk_size, geom_grid_size)
+    new_h = hash_poi_snapshot(new, tag_cols, key_cols, chunk_size, geom_grid_size)
+
+    return diff_poi_hashes(old_h, new_h, key_cols)
+# ============================================================================================
+def diff_poi_snapshot_series(
+    paths: Iterable[Union[str, pathlib.Path]],
+    tag_cols: Sequence[str],
+    save_folder: Optional[Union[str, pathlib.Path]] = None,
+    key_cols: Sequence[str] = KEY_COLS,
+    chunk_size: int = 500_000,
+    geom_grid_size: Optional[float] = None,
+) -> pd.DataFrame:
+    """
+    Diff each consecutive pair of dated snapshots, hashing every file once.
+
+    Only two hash tables are held at a time, so a long series (e.g. a year of
+    monthly national extracts) runs in bounded memory.
+
+    Parameters
+    ----------
+    paths : iterable of paths
+        Snapshots in chronological order.
+    tag_cols : sequence of str
+        Tag columns to compare; fixed across the series so hashes stay comparable.
+    save_folder : path or None
+        If given, write `{old}__{new}_{change}.csv` for each pair and change set.
+    key_cols, chunk_size, geom_grid_size
+        See `hash_poi_snapshot`.
+
+    Returns
+    -------
+    pandas.DataFrame
+        One row per pair: old, new and the count of each change set.
+    """
+    paths = [pathlib.Path(p) for p in paths]
+    if save_folder is not None:
+        save_folder = pathlib.Path(save_folder)
+        save_folder.mkdir(parents=True, exist_ok=True)
+
+    summary = []
+    prev_path, prev_h = None, None
+    for path in progress(paths, desc='Diffing POI snapshots'):
+        cur_h = hash_poi_snapshot(path, tag_cols, key_cols, chunk_size, geom_grid_size)
+
+        if prev_h is not None:
+            diff = diff_poi_hashes(prev_h, cur_h, key_cols)
+            summary.append({'old': prev_path.stem, 'new': path.stem, **{k: len(v) for k, v in diff.items()}})
+            if save_folder is not None:
+                for change, frame in diff.items():
+                    frame.to_csv(save_folder / f'{prev_path.stem}__{path.stem}_{change}.csv', index=False)
+            echo(summary[-1])
+
+        prev_path, prev_h = path, cur_h
+
+    return pd.DataFrame(summary)
+# ============================================================================================
@@ -0,0 +1,6 @@
+import pathlib
+import sys
+
+# The package is used from a checkout (no install), so make it importable
+# however pytest is started
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[1]))
@@ -0,0 +1,65 @@
+import networkx as nx
+import numpy as np
+import pytest
+
+from shapely.geometry import LineString
+
+from osm_process_tool.network.locator import NetworkLocator
+
+
+@pytest.fixture
+def graph():
+    # a - b stored reversed (b → a), b - c stored forward
+    G = nx.Graph(crs='EPSG:3414')
+    for n, (x, y) in {'a': (0, 0), 'b': (10, 0), 'c': (10, 10)}.items():
+        G.add_node(n, proj_x=float(x), proj_y=float(y))
+    G.add_edge('a', 'b', geometry=LineString([(10, 0), (0, 0)]))
+    G.add_edge('b', 'c', geometry=LineString([(10, 0), (10, 10)]))
+    return G
+
+
+def _position_from_u(G, edge_id, x):
+    # distance from node edge_id[0] along a straight edge, for a point on it
+    u = G.nodes[edge_id[0]]
+    return float(np.hypot(x[0] - u['proj_x'], x[1] - u['proj_y']))
+
+
+def test_edge_orientation(graph):
+    locator = NetworkLocator.from_graph(graph)
+    reversed_ = dict(zip(locator.edge_ids, locator.edge_reversed))
+    assert reversed_[('a', 'b')]
+    assert not reversed_[('b', 'c')]
+
+
+def test_positions_measured_from_first_node(graph):
+    locator = NetworkLocator.from_graph(graph)
+    edge_ids, distances, positions = locator.nearest_edge([2., 11.], [1., 7.])
+
+    assert edge_ids == [('a', 'b'), ('b', 'c')]
+    np.testing.assert_allclose(distances, [1., 1.])
+    np.testing.assert_allclose(positions, [
+        _position_from_u(graph, edge_ids[0], (2., 0.)),
+        _position_from_u(graph, edge_ids[1], (10., 7.))])
+
+
+def test_max_distance_misses(graph):
+    locator = NetworkLocator.from_graph(graph)
+
+    edge_ids, distances, positions = locator.nearest_edge([2., 50.], [1., 50.], max_distance=5.)
+    assert edge_ids == [('a', 'b'), None]
+    assert np.isinf(distances[1]) and np.isnan(positions[1])
+
+    node_ids, node_dist = locator.nearest_node([1., 50.], [0., 50.], max_distance=5.)
+    assert node_ids.tolist() == ['a', None]
+    assert node_dist[0] == pytest.approx(1.) and np.isinf(node_dist[1])
+
+
+def test_save_load_round_trip(graph, tmp_path):
+    locator = NetworkLocator.from_graph(graph)
+    locator.save(tmp_path / 'locator.pkl')
+    loaded = NetworkLocator.load(tmp_path / 'locator.pkl')
+
+    assert loaded.crs == 'EPSG:3414'
+    np.testing.assert_array_equal(loaded.edge_reversed, locator.edge_reversed)
+    for a, b in zip(locator.nearest_edge([2., 11.], [1., 7.]), loaded.nearest_edge([2., 11.], [1., 7.])):
+        np.testing.assert_array_equal(np.asarray(a, dtype=object), np.asarray(b, dtype=object))
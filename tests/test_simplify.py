@@ -0,0 +1,131 @@
+import random
+
+import networkx as nx
+import pytest
+
+from shapely.geometry import LineString
+
+from osm_process_tool.network.osm_network_preprocess import simplify_degree2_nodes
+from osm_process_tool.network.validate import validate_network
+
+
+def _add_node(G, n, x, y):
+    G.add_node(n, proj_x=float(x), proj_y=float(y))
+
+
+def _add_edge(G, u, v, rng=None, **attrs):
+    pu = (G.nodes[u]['proj_x'], G.nodes[u]['proj_y'])
+    pv = (G.nodes[v]['proj_x'], G.nodes[v]['proj_y'])
+    # Stored orientation is arbitrary in an undirected graph
+    coords = [pv, pu] if (rng is not None and rng.random() < 0.5) else [pu, pv]
+    geom = LineString(coords)
+    G.add_edge(u, v, geometry=geom, length_m=geom.length, **attrs)
+
+
+def _random_grid(seed, size=12, p_drop=0.3, max_split=3):
+    # Grid with random gaps and edges split into degree-2 chains
+    rng = random.Random(seed)
+    G = nx.Graph(crs='EPSG:3414')
+    for i in range(size):
+        for j in range(size):
+            _add_node(G, (i, j), i * 100, j * 100)
+
+    pairs = [((i, j), (i + 1, j)) for i in range(size - 1) for j in range(size)] + \
+            [((i, j), (i, j + 1)) for i in range(size) for j in range(size - 1)]
+    for k, (u, v) in enumerate(pairs):
+        if rng.random() < p_drop:
+            continue
+        chain = [u]
+        for s in range(rng.randint(0, max_split)):
+            n = ('mid', k, s)
+            t = (s + 1) / (max_split + 1)
+            _add_node(G, n,
+                      G.nodes[u]['proj_x'] + t * (G.nodes[v]['proj_x'] - G.nodes[u]['proj_x']),
+                      G.nodes[u]['proj_y'] + t * (G.nodes[v]['proj_y'] - G.nodes[u]['proj_y']))
+            chain.append(n)
+        chain.append(v)
+        for a, b in zip(chain[:-1], chain[1:]):
+            _add_edge(G, a, b, rng, highway='footway')
+    return G
+
+
+def _assert_geometry_consistent(H):
+    results = validate_network(H, checks=['missing_geometry', 'endpoint_mismatch', 'length_mismatch'])
+    for name, res in results.items():
+        assert res['count'] == 0, f'{name}: {res["ids"][:5]}'
+# ============================================================================================
+@pytest.mark.parametrize('seed', [0, 1, 2])
+def test_shortest_paths_preserved(seed):
+    G = _random_grid(seed)
+    H = simplify_degree2_nodes(G)
+
+    assert H.number_of_nodes() < G.number_of_nodes()
+    assert set(H.nodes()) <= set(G.nodes())
+
+    dist_G = dict(nx.all_pairs_dijkstra_path_length(G, weight='length_m'))
+    dist_H = dict(nx.all_pairs_dijkstra_path_length(H, weight='length_m'))
+    for s, targets in dist_H.items():
+        assert set(targets) == {t for t in dist_G[s] if t in H}
+        for t, d in targets.items():
+            assert d == pytest.approx(dist_G[s][t])
+
+
+@pytest.mark.parametrize('seed', [0, 1, 2])
+def test_geometry_and_length_consistent(seed):
+    H = simplify_degree2_nodes(_random_grid(seed))
+    _assert_geometry_consistent(H)
+    assert H.graph['crs'] == 'EPSG:3414'
+
+
+def test_chain_into_self_loop_kept():
+    # 'a' has degree 3; a - n1 - n2 - a would merge into a self-loop on 'a'
+    G = nx.Graph()
+    for n, (x, y) in {'a': (0, 0), 'b': (-100, 0), 'n1': (100, 0), 'n2': (100, 100)}.items():
+        _add_node(G, n, x, y)
+    _add_edge(G, 'b', 'a')
+    _add_edge(G, 'a', 'n1')
+    _add_edge(G, 'n1', 'n2')
+    _add_edge(G, 'n2', 'a')
+
+    H = simplify_degree2_nodes(G)
+
+    assert set(H.nodes()) == set(G.nodes())
+    assert {frozenset(e) for e in H.edges()} == {frozenset(e) for e in G.edges()}
+    assert nx.number_of_selfloops(H) == 0
+    _assert_geometry_consistent(H)
+
+
+def test_chain_parallel_to_edge_kept():
+    # a - b directly and via n1; merging the chain would duplicate (a, b)
+    G = nx.Graph()
+    coords = {'a': (0, 0), 'b': (100, 0), 'n1': (50, 50), 'c': (-100, 0), 'd': (200, 0)}
+    for n, (x, y) in coords.items():
+        _add_node(G, n, x, y)
+    _add_edge(G, 'c', 'a')
+    _add_edge(G, 'a', 'b')
+    _add_edge(G, 'a', 'n1')
+    _add_edge(G, 'n1', 'b')
+    _add_edge(G, 'b', 'd')
+
+    H = simplify_degree2_nodes(G)
+
+    assert 'n1' in H
+    assert H.edges['a', 'b']['length_m'] == pytest.approx(100.)
+    _assert_geometry_consistent(H)
+
+
+def test_two_parallel_chains_merge_once():
+    # a - n1 - b and a - n2 - b: only one chain may become the edge (a, b)
+    G = nx.Graph()
+    coords = {'a': (0, 0), 'b': (100, 0), 'n1': (50, 50), 'n2': (50, -50), 'c': (-100, 0), 'd': (200, 0)}
+    for n, (x, y) in coords.items():
+        _add_node(G, n, x, y)
+    for u, v in [('c', 'a'), ('a', 'n1'), ('n1', 'b'), ('a', 'n2'), ('n2', 'b'), ('b', 'd')]:
+        _add_edge(G, u, v)
+
+    H = simplify_degree2_nodes(G)
+
+    assert H.number_of_nodes() == G.number_of_nodes() - 1
+    assert nx.dijkstra_path_length(H, 'c', 'd', weight='length_m') == \
+        pytest.approx(nx.dijkstra_path_length(G, 'c', 'd', weight='length_m'))
+    _assert_geometry_consistent(H)
@@ -0,0 +1,107 @@
+import networkx as nx
+import numpy as np
+import pytest
+
+from shapely.geometry import LineString
+
+from osm_process_tool.network.snapshot import NetworkSnapshot, export_network_snapshot
+
+
+def _line_graph(nodes):
+    G = nx.Graph(crs='EPSG:3414')
+    for i, n in enumerate(nodes):
+        G.add_node(n, proj_x=float(i), proj_y=0., kind='a' if i % 2 else 'b')
+    for i, (u, v) in enumerate(zip(nodes[:-1], nodes[1:])):
+        G.add_edge(u, v, length_m=1. + i, geometry=LineString([(i, 0), (i + 1, 0)]),
+                   highway=['footway', 'steps'] if i == 0 else 'footway')
+    return G
+
+
+@pytest.fixture
+def str_snapshot(tmp_path):
+    G = _line_graph(['W_1', 'W_2', 'W_100', 'X'])
+    return G, NetworkSnapshot(export_network_snapshot(
+        G, tmp_path / 'snap', edge_cat_attrs=['highway'], node_cat_attrs=['kind']))
+
+
+@pytest.fixture
+def int_snapshot(tmp_path):
+    G = _line_graph([5, 3, 40, 1])
+    return G, NetworkSnapshot(export_network_snapshot(G, tmp_path / 'snap'))
+
+
+def test_string_ids_are_not_truncated(str_snapshot):
+    G, snap = str_snapshot
+    for n in G.nodes():
+        assert snap.node_ids[snap.node_index(n)] == n
+    np.testing.assert_array_equal(snap.node_ids[snap.node_index(['W_100', 'W_1'])], ['W_100', 'W_1'])
+
+    # longer than, a prefix of, or a padded form of a stored ID
+    for query in ['W_10', 'W_1000', 'W_', 'W_1 ', 'X_longer_than_any_id']:
+        with pytest.raises(KeyError):
+            snap.node_index(query)
+    with pytest.raises(KeyError):
+        snap.node_index(['W_1', 'W_10'])
+
+
+def test_int_snapshot_matches_only_int_queries(int_snapshot):
+    G, snap = int_snapshot
+    assert snap.node_ids.dtype == np.int64
+    assert snap.node_index(40) == list(snap.node_ids).index(40)
+    np.testing.assert_array_equal(snap.node_ids[snap.node_index([1, 5])], [1, 5])
+
+    for query in [2, 40.5, '40', 'W_1']:
+        with pytest.raises(KeyError):
+            snap.node_index(query)
+
+
+def test_colliding_ids_rejected(tmp_path):
+    G = nx.Graph()
+    G.add_edge(1, '1')
+    with pytest.raises(AssertionError):
+        export_network_snapshot(G, tmp_path / 'snap')
+
+
+def test_adjacency_and_weights(int_snapshot):
+    G, snap = int_snapshot
+    assert snap.number_of_nodes() == G.number_of_nodes()
+    assert snap.number_of_edges() == G.number_of_edges()
+    assert snap.crs == 'EPSG:3414' and not snap.is_directed()
+    for n in G.nodes():
+        assert set(snap.neighbors(n).tolist()) == set(G.neighbors(n))
+        assert snap.degree(n) == G.degree(n)
+        for e in snap.incident_edges(n):
+            u, v = snap.edge_nodes(e).tolist()
+            assert n in (u, v)
+            assert snap.weight[e] == G.edges[u, v]['length_m']
+
+
+def test_geometry_round_trip(str_snapshot):
+    G, snap = str_snapshot
+    rows = np.arange(snap.number_of_edges())
+    geoms = snap.edge_geometry(rows)
+    for e, geom in zip(rows, geoms):
+        u, v = snap.edge_nodes(e).tolist()
+        assert geom.equals_exact(G.edges[u, v]['geometry'], 0.)
+    assert snap.edge_geometry(0).equals_exact(geoms[0], 0.)
+
+
+def test_categorical_round_trip(str_snapshot):
+    G, snap = str_snapshot
+    for e in range(snap.number_of_edges()):
+        u, v = snap.edge_nodes(e).tolist()
+        expected = G.edges[u, v]['highway']
+        assert snap.edge_attr('highway', e) == (str(expected) if isinstance(expected, list) else expected)
+    nodes = list(G.nodes())
+    assert snap.node_attr('kind', nodes).tolist() == [G.nodes[n]['kind'] for n in nodes]
+
+    with pytest.raises(KeyError):
+        snap.edge_attr('surface', 0)
+
+
+def test_missing_categorical_is_none(tmp_path):
+    G = _line_graph([1, 2, 3])
+    del G.edges[1, 2]['highway']
+    snap = NetworkSnapshot(export_network_snapshot(G, tmp_path / 'snap', edge_cat_attrs=['highway']))
+    values = {tuple(snap.edge_nodes(e).tolist()): snap.edge_attr('highway', e) for e in range(2)}
+    assert values[(1, 2)] is None and values[(2, 3)] == 'footway'